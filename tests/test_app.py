@@ -1,6 +1,10 @@
+import io
+import pickle
+import random
 import unittest
+from array import array
 
-from tetris.app import TetrisGame, TetrominoType
+from tetris.app import Board, ErrorPolicy, SessionTable, TetrisApp, TetrisGame, TetrominoType
 
 
 class TetrisGameTest(unittest.TestCase):
@@ -47,6 +51,28 @@ class TetrisGameTest(unittest.TestCase):
         self.game.place_tetromino(TetrominoType.I.value, 0)
         self.assertEqual(self.game.calculate_height(), 1)
 
+    def test_calculate_height_tracks_stack_top(self):
+        """Test the tracked height through clears, loads and grid assignment."""
+        board = self.game.board
+        self.game.process_input_line("Q0,Q2,Q4,Q6,Q8,I0")
+        self.assertEqual(self.game.calculate_height(), 1)
+        restored = Board.from_bytes(board.to_bytes())
+        self.assertEqual(restored.calculate_height(), 1)
+        rows = [0] * board.height
+        rows[-3] = 1
+        board.grid = rows
+        self.assertEqual(self.game.calculate_height(), 3)
+        board.reset()
+        self.assertEqual(self.game.calculate_height(), 0)
+
+    def test_direct_grid_writes_update_height(self):
+        """Rows written through ``grid`` count towards the height."""
+        self.game.calculate_height()
+        self.game.board.grid[50] = 1
+        self.assertEqual(self.game.calculate_height(), 50)
+        self.game.clear_lines()
+        self.assertEqual(self.game.calculate_height(), 50)
+
     def test_process_input_single_piece(self):
         """Test processing a single tetromino placement (bitfield version)."""
         self.game.process_input_line("Q0")
@@ -94,5 +120,218 @@ class TetrisGameTest(unittest.TestCase):
         self.game.process_input_line(test_input)
         self.assertEqual(self.game.calculate_height(), 3)
 
+    def test_compact_grid_for_narrow_boards(self):
+        """Boards up to 64 columns store rows in a compact array."""
+        game = TetrisGame(width=64, height=10)
+        grid = game.grid
+        assert isinstance(grid, array)
+        self.assertGreaterEqual(grid.itemsize * 8, 64)
+        game.place_tetromino(TetrominoType.I.value, 0)
+        self.assertEqual(grid[-1], 0b1111 << 60)
+        self.assertEqual(grid, [0] * 9 + [0b1111 << 60])
+        self.assertNotEqual(grid, [0] * 10)
+
+    def test_wide_board_falls_back_to_int_rows(self):
+        """Boards wider than 64 columns keep arbitrary-precision rows."""
+        game = TetrisGame(width=80, height=10)
+        self.assertIsInstance(game.grid, list)
+        self.assertEqual(game.process_input_line("I0,I76"), 1)
+
+    def test_validate_line_returns_placements(self):
+        """Validation parses every token without touching the board."""
+        placements = self.game.validate_line("Q0, I4,")
+        self.assertEqual(placements, [(TetrominoType.Q.value, 0), (TetrominoType.I.value, 4)])
+        self.assertEqual(self.game.calculate_height(), 0)
+
+    def test_validate_line_rejects_out_of_range_column(self):
+        """Columns pushing a tetromino off either edge fail validation."""
+        with self.assertRaises(ValueError):
+            self.game.validate_line("I7")
+        with self.assertRaises(ValueError):
+            self.game.validate_line("Q-1")
+
+    def test_process_input_fails_before_placing(self):
+        """A malformed token later in the line leaves the board untouched."""
+        with self.assertRaises(ValueError):
+            self.game.process_input_line("Q0,Q2,X4")
+        self.assertEqual(self.game.calculate_height(), 0)
+
+    def test_step_debug_log_names_the_shape(self):
+        """Step debug messages name the shape rather than dumping its rows."""
+        with self.assertLogs("tetris.app", level="DEBUG") as logs:
+            self.game.process_input_line("Q0")
+            self.game.process_chunk("T2")
+        self.assertIn("DEBUG:tetris.app:Step 1: place Q at 0", logs.output)
+        self.assertIn("DEBUG:tetris.app:Step 1: place T at 2", logs.output)
+
+
+class BoardSerializationTest(unittest.TestCase):
+    HEADER_SIZE = 13
+
+    def make_board(self, width: int, height: int = 50) -> Board:
+        game = TetrisGame(width=width, height=height)
+        game.process_input_line("Q0,T1,L2,I0")
+        return game.board
+
+    def test_round_trip_across_widths(self):
+        for width in (4, 8, 10, 16, 20, 64, 100):
+            with self.subTest(width=width):
+                board = self.make_board(width)
+                self.assertEqual(Board.from_bytes(board.to_bytes()), board)
+
+    def test_only_occupied_rows_are_stored(self):
+        board = self.make_board(10, height=1000)
+        data = board.to_bytes()
+        self.assertEqual(len(data), self.HEADER_SIZE + board.calculate_height() * 2)
+        self.assertEqual(len(Board(width=10, height=1000).to_bytes()), self.HEADER_SIZE)
+
+    def test_load_from_memoryview_slice(self):
+        board = self.make_board(10)
+        buffer = bytearray(b"junk") + board.to_bytes()
+        target = Board(width=10, height=50)
+        target.place_tetromino(TetrominoType.Q.value, 4)
+        target.load(memoryview(buffer)[4:])
+        self.assertEqual(target, board)
+
+    def test_pickle_uses_compact_format(self):
+        board = self.make_board(10, height=1000)
+        restored = pickle.loads(pickle.dumps(board))
+        self.assertEqual(restored, board)
+        self.assertLess(len(pickle.dumps(board)), 200)
+
+    def test_invalid_data_rejected(self):
+        data = self.make_board(10).to_bytes()
+        for bad in (b"", b"XX" + data[2:], data[:-1], data + b"\0"):
+            with self.subTest(bad=bad[:4]):
+                with self.assertRaises(ValueError):
+                    Board.from_bytes(bad)
+        with self.assertRaises(ValueError):
+            Board(width=10, height=40).load(data)
+
+
+class TetrisAppTest(unittest.TestCase):
+    def run_app(self, text: str, on_error=ErrorPolicy.ABORT) -> str:
+        output = io.StringIO()
+        app = TetrisApp(width=4, height=4, on_error=on_error)
+        app.process_stream(io.StringIO(text), output)
+        return output.getvalue()
+
+    def test_abort_policy_raises(self):
+        with self.assertRaises(ValueError):
+            self.run_app("Q0\nQ9\nI0\n")
+
+    def test_skip_policy_drops_bad_lines(self):
+        self.assertEqual(self.run_app("Q0\nQ9\nI0\n", "skip"), "2\n0\n")
+
+    def test_emit_error_policy_writes_error_record(self):
+        output = self.run_app("Q0\nQ0,Q0,Q0\nI0\n", ErrorPolicy.EMIT_ERROR)
+        lines = output.splitlines()
+        self.assertEqual(lines[0], "2")
+        self.assertTrue(lines[1].startswith("error: No space"))
+        self.assertEqual(lines[2], "0")
+
+    def test_unknown_policy_rejected(self):
+        with self.assertRaises(ValueError):
+            TetrisApp(on_error="ignore")
+
+    def test_persistent_board_across_lines(self):
+        output = io.StringIO()
+        app = TetrisApp(persistent=True)
+        app.process_stream(io.StringIO("Q0\nQ0\nQ2,Q4,Q6,Q8\n"), output)
+        self.assertEqual(output.getvalue(), "2\n4\n2\n")
+
+    def test_persistent_chunks_match_concatenated_history(self):
+        rng = random.Random(0)
+        shapes = list(TetrominoType)
+        for width in (4, 10, 80):
+            with self.subTest(width=width):
+                app = TetrisApp(width, 200, persistent=True)
+                history = []
+                for _ in range(20):
+                    chunk = ",".join(
+                        f"{shape.name}{rng.randint(0, width - shape.value.width)}"
+                        for shape in rng.choices(shapes, k=rng.randint(1, 6))
+                    )
+                    history.append(chunk)
+                    expected = TetrisGame(width, 200).process_input_line(",".join(history))
+                    self.assertEqual(app.process_line(chunk), expected)
+
+    def test_persistent_board_keeps_full_rows_between_chunks(self):
+        app = TetrisApp(4, 50, persistent=True)
+        self.assertEqual(app.process_line("S1,I0"), 2)
+        self.assertEqual(app.process_line("S0"), 4)
+
+    def test_failed_chunk_leaves_persistent_board_unchanged(self):
+        for policy in (ErrorPolicy.SKIP, ErrorPolicy.EMIT_ERROR):
+            with self.subTest(policy=policy):
+                output = io.StringIO()
+                app = TetrisApp(4, 4, persistent=True, on_error=policy)
+                app.process_stream(io.StringIO("Q0\nI0,Q0,Q0\nQ2\n"), output)
+                self.assertEqual(output.getvalue().splitlines()[-1], "0")
+                self.assertEqual(app.game.board.calculate_height(), 2)
+
+    def test_keyed_sessions_are_independent(self):
+        app = TetrisApp()
+        self.assertEqual(app.process_line("Q0", session_id="a"), 2)
+        self.assertEqual(app.process_line("Q0", session_id="b"), 2)
+        self.assertEqual(app.process_line("I0", session_id="a"), 3)
+        self.assertEqual(app.process_line("Q0"), 2)
+        self.assertEqual(app.process_line("Q0"), 2)
+
+
+class SessionTableTest(unittest.TestCase):
+    def test_get_creates_and_reuses_games(self):
+        table = SessionTable(width=4, height=8)
+        game = table.get("a")
+        self.assertIs(table.get("a"), game)
+        self.assertEqual((game.width, game.height), (4, 8))
+        self.assertEqual(len(table), 1)
+
+    def test_least_recently_used_session_is_evicted(self):
+        table = SessionTable(max_sessions=2)
+        table.get("a")
+        table.get("b")
+        table.get("a")
+        table.get("c")
+        self.assertIn("a", table)
+        self.assertNotIn("b", table)
+        self.assertIn("c", table)
+
+    def test_pop_and_clear(self):
+        table = SessionTable()
+        game = table.get("a")
+        self.assertIs(table.pop("a"), game)
+        self.assertIsNone(table.pop("a"))
+        table.get("b")
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+    def test_spilled_sessions_are_restored(self):
+        table = SessionTable(width=4, height=8, max_sessions=1, spill=True)
+        table.get("a").process_line("Q0,I0,Q2")
+        grid = table.get("a").grid[:]
+        table.get("b")
+        self.assertEqual(table.spilled, 1)
+        self.assertIn("a", table)
+        self.assertEqual(table.get("a").grid, grid)
+        self.assertEqual(table.spilled, 1)
+
+    def test_spilled_sessions_are_capped(self):
+        table = SessionTable(width=4, height=8, max_sessions=1, spill=True, max_spilled=1)
+        table.get("a").process_line("Q0")
+        table.get("b").process_line("Q0")
+        table.get("c")
+        self.assertEqual(table.spilled, 1)
+        self.assertNotIn("a", table)
+        self.assertIn("b", table)
+        self.assertEqual(table.get("b").board.calculate_height(), 2)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SessionTable(max_sessions=0)
+        with self.assertRaises(ValueError):
+            SessionTable(max_spilled=-1)
+
+
 if __name__ == "__main__":
     unittest.main()
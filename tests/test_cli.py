@@ -28,6 +28,33 @@ def test_cli_run_calls_app_run(monkeypatch):
     assert called['init']['height'] == 8
     assert called['run'] is True
 
+def test_parse_arguments_on_error():
+    assert TetrisCLI.parse_arguments([]).on_error == "abort"
+    assert TetrisCLI.parse_arguments(["--on-error", "skip"]).on_error == "skip"
+    with pytest.raises(SystemExit):
+        TetrisCLI.parse_arguments(["--on-error", "ignore"])
+
+def test_parse_arguments_persistent():
+    assert TetrisCLI.parse_arguments([]).persistent is False
+    assert TetrisCLI.parse_arguments(["--persistent"]).persistent is True
+
+def test_cli_run_multiplex(monkeypatch):
+    called = {}
+    class DummyMux:
+        def __init__(self, **kwargs):
+            called['init'] = kwargs
+        def run(self):
+            called['run'] = True
+    monkeypatch.setattr("tetris.cli.MultiplexApp", DummyMux)
+    cli = TetrisCLI(
+        argv=["--multiplex", "--workers", "3", "--max-sessions", "7", "--max-spilled", "9"]
+    )
+    cli.run()
+    assert called['init']['workers'] == 3
+    assert called['init']['max_sessions'] == 7
+    assert called['init']['max_spilled'] == 9
+    assert called['run'] is True
+
 def test_main_invokes_cli_run(monkeypatch):
     called = {}
     class DummyCLI:
@@ -0,0 +1,162 @@
+import io
+import json
+import pickle
+import time
+
+import pytest
+
+from tetris.app import Board
+from tetris.cli import TetrisCLI
+from tetris.engines import (
+    CALIBRATION_LINES,
+    CALIBRATION_TOKENS,
+    ENGINES,
+    REFERENCE,
+    SkylineBoard,
+    SkylineGame,
+    calibrate,
+    calibration_workload,
+    register_engine,
+    select_engine,
+    size_bucket,
+    unregister_engine,
+)
+from tetris.fuzz import fuzz
+
+LINES = ["Q0,I2,I6,I0,I6,I6,Q2,Q4", "T1,Z3,I4", "I0,I4,Q8", "Q0,Q1,Q2"]
+
+
+class WrongHeightGame(SkylineGame):
+    __slots__ = ()
+
+    def process_input_line(self, line: str) -> int:
+        return super().process_input_line(line) + 1
+
+
+@pytest.mark.parametrize("name", sorted(ENGINES))
+def test_engine_interface(name):
+    engine = ENGINES[name](10, 100)
+    assert (engine.width, engine.height) == (10, 100)
+    assert engine.batch_process(LINES) == [3, 4, 1, 6]
+    engine.reset()
+    assert engine.process_line("Q0") == 2
+    assert engine.process_line("Q0") == 4
+    engine.reset()
+    assert engine.process_line("Q0") == 2
+
+
+def test_skyline_matches_reference():
+    report = fuzz({"skyline": SkylineGame}, cases=500, seed=11, throughput_lines=0)
+    assert report.ok, report.format()
+
+
+def test_skyline_board_tracks_top_through_serialization():
+    game = SkylineGame(10, 50)
+    game.process_line("Q0,Q2,Q4,Q6,Q8,T3")
+    restored = pickle.loads(pickle.dumps(game.board))
+    assert isinstance(restored, SkylineBoard)
+    assert restored == game.board
+    loaded = SkylineBoard.from_bytes(Board(10, 50).to_bytes())
+    assert loaded == SkylineBoard(10, 50)
+
+
+def test_skyline_sees_direct_grid_writes():
+    game = SkylineGame(10, 20)
+    game.process_line("I0")
+    game.board.grid[5] = game.full_row_mask ^ 1
+    game.process_line("I0")
+    assert game.grid[4] == 0b1111 << 6
+    assert game.process_line("") == 16
+
+
+def test_calibrate_rejects_disagreeing_engines():
+    calibration = calibrate(10, 20, {**ENGINES, "wrong": WrongHeightGame}, lines=5)
+    assert calibration.rejected == ["wrong"]
+    assert set(calibration.timings) == set(ENGINES)
+    assert calibration.fastest in ENGINES
+
+
+def test_size_bucket():
+    assert size_bucket(None) == "stream"
+    assert size_bucket(0) == "1e0"
+    assert size_bucket(999) == "1e2"
+    assert size_bucket(1000) == "1e3"
+
+
+def test_calibration_workload_scales_with_bucket():
+    assert calibration_workload(None) == (CALIBRATION_LINES, CALIBRATION_TOKENS)
+    assert calibration_workload(3000) == calibration_workload(9999) == (18, 18)
+    small, large = calibration_workload(100), calibration_workload(10**5)
+    assert small[0] * small[1] < large[0] * large[1]
+    lines, tokens = calibration_workload(10**12)
+    assert lines * tokens <= 10_000
+
+
+def test_calibration_workload_shrinks_on_tall_boards():
+    lines, tokens = calibration_workload(10**6, height=10_000)
+    assert lines * tokens * 10_000 <= 500_000
+    lines, tokens = calibration_workload(None, height=10_000)
+    assert lines * tokens * 10_000 <= 500_000
+
+
+def test_calibrate_stops_at_time_budget():
+    start = time.perf_counter()
+    calibration = calibrate(10, 2000, lines=200, tokens=50, budget=0.01)
+    assert time.perf_counter() - start < 5
+    assert set(calibration.timings) == set(ENGINES)
+
+
+def test_select_engine_calibrates_bucket_workload(tmp_path, monkeypatch):
+    calls = []
+
+    def record(width, height, *, lines, tokens):
+        calls.append((lines, tokens))
+        return calibrate(width, height, lines=1, tokens=1)
+
+    monkeypatch.setattr("tetris.engines.calibrate", record)
+    select_engine(10, 200, 5000, cache_path=str(tmp_path / "engines.json"))
+    assert calls == [calibration_workload(1000, 200)]
+
+
+def test_select_engine_caches_choice(tmp_path, monkeypatch):
+    cache_path = tmp_path / "engines.json"
+    name = select_engine(10, 200, 5000, cache_path=str(cache_path))
+    assert name in ENGINES
+    assert json.loads(cache_path.read_text()) == {"10x200:1e3": name}
+
+    def fail(*args, **kwargs):
+        raise AssertionError("calibration should be cached")
+
+    monkeypatch.setattr("tetris.engines.calibrate", fail)
+    assert select_engine(10, 200, 7000, cache_path=str(cache_path)) == name
+
+
+def test_select_engine_recalibrates_unknown_cached_engine(tmp_path):
+    cache_path = tmp_path / "engines.json"
+    cache_path.write_text(json.dumps({"10x20:stream": "gone"}))
+    assert select_engine(10, 20, cache_path=str(cache_path)) in ENGINES
+
+
+def test_register_rejects_auto():
+    with pytest.raises(ValueError):
+        register_engine("auto", SkylineGame)
+    register_engine("tmp", SkylineGame)
+    unregister_engine("tmp")
+    assert "tmp" not in ENGINES
+
+
+def test_cli_engine_selection(tmp_path, monkeypatch):
+    assert TetrisCLI.parse_arguments([]).engine == REFERENCE
+    with pytest.raises(SystemExit):
+        TetrisCLI.parse_arguments(["--engine", "missing"])
+
+    output = io.StringIO()
+    cli = TetrisCLI(argv=["--engine", "skyline"], input_stream=io.StringIO("Q0\nQ0,Q1\n"), output_stream=output)
+    assert cli.resolve_engine() is SkylineGame
+    cli.run()
+    assert output.getvalue() == "2\n4\n"
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    cli = TetrisCLI(argv=["--engine", "auto", "--height", "20"], input_stream=io.StringIO("Q0\n"))
+    assert cli.resolve_engine() in ENGINES.values()
+    assert (tmp_path / "tetromino" / "engines.json").exists()
@@ -0,0 +1,88 @@
+import io
+import random
+
+import pytest
+
+from tetris.app import TetrisGame
+from tetris.cli import TetrisCLI
+from tetris.engines import ENGINES, REFERENCE, get_engine, register_engine, unregister_engine
+from tetris.fuzz import compare_case, fuzz, random_case, random_token, shrink
+
+
+class SingleClearGame(TetrisGame):
+    """Broken engine that clears at most one full row per line."""
+
+    def clear_lines(self) -> int:
+        mask = self.full_row_mask
+        grid = self.grid
+        for i in range(self.height - 1, -1, -1):
+            if grid[i] == mask:
+                del grid[i]
+                grid.insert(0, 0)
+                return 1
+        return 0
+
+
+@pytest.fixture
+def broken_engine():
+    register_engine("single-clear", SingleClearGame)
+    yield SingleClearGame
+    unregister_engine("single-clear")
+
+
+def test_random_tokens_stay_in_range():
+    rng = random.Random(1)
+    game = TetrisGame(width=10, height=10)
+    for _ in range(500):
+        game.validate_line(random_token(rng, 10, invalid_rate=0))
+
+
+def test_random_case_shape():
+    steps = random_case(random.Random(2), 10, max_steps=3, max_tokens=5)
+    assert 1 <= len(steps) <= 3
+    assert all(1 <= len(line.split(",")) <= 5 for line in steps)
+
+
+def test_reference_agrees_with_itself():
+    assert compare_case("copy", TetrisGame, 10, 20, ["Q0,Q2,Q4,Q6,Q8", "I0,X1", "T7"]) is None
+
+
+def test_shrink_finds_minimal_reproducer():
+    steps = ["T1,Z3", "Q0,Q2,Q4,Q6,Q8,L0", "J7"]
+    assert shrink(SingleClearGame, 10, 20, steps) == ["Q0,Q2,Q4,Q6,Q8"]
+
+
+def test_fuzz_reports_mismatch(broken_engine):
+    report = fuzz(cases=300, seed=3, widths=(4,), throughput_lines=20)
+    assert not report.ok
+    (mismatch,) = report.mismatches
+    assert mismatch.engine == "single-clear"
+    assert mismatch.expected != mismatch.actual
+    assert {REFERENCE, "single-clear"} <= set(report.throughput)
+    assert "single-clear" in report.format()
+
+
+def test_fuzz_clean_run():
+    report = fuzz(cases=50, seed=4, throughput_lines=0)
+    assert report.ok
+    assert report.cases == 50
+    assert report.throughput == {}
+    assert "no mismatches" in report.format()
+
+
+def test_registry():
+    assert get_engine(REFERENCE) is TetrisGame
+    with pytest.raises(ValueError):
+        register_engine(REFERENCE, TetrisGame)
+    with pytest.raises(ValueError):
+        unregister_engine(REFERENCE)
+    with pytest.raises(ValueError):
+        get_engine("missing")
+    assert ENGINES[REFERENCE] is TetrisGame
+
+
+def test_cli_fuzz_subcommand(broken_engine):
+    args = TetrisCLI.parse_arguments(["fuzz", "--cases", "5", "--seed", "9"])
+    assert (args.command, args.cases, args.seed) == ("fuzz", 5, 9)
+    with pytest.raises(SystemExit):
+        TetrisCLI(argv=["fuzz", "--cases", "500"], output_stream=io.StringIO()).run()
@@ -0,0 +1,80 @@
+"""Memory footprint guards for pools of idle games.
+
+Per-game bytes are measured with :func:`sys.getsizeof` and recorded as
+the ``bytes_per_game`` test property; that is the only guard enforced by
+a plain ``pytest`` run. The ``memray`` tests check allocation limits with
+pytest-memray and need every allocation to reach the system allocator,
+so run them with::
+
+    PYTHONMALLOC=malloc pytest --memray -m memray
+"""
+
+import os
+import sys
+
+import pytest
+
+from tetris.app import TetrisGame
+
+pytest.importorskip("pytest_memray")
+
+POOL_SIZE = 32
+WIDTH = 10
+HEIGHTS = (100, 1000, 10000)
+# Two bytes per row for a 10-column board plus a small allowance for the
+# game, board and array headers.
+ROW_BYTES = 2
+OVERHEAD_BYTES = 256
+# Allocator headers and interpreter bookkeeping seen by memray per game.
+ALLOCATOR_SLACK_BYTES = 512
+
+requires_malloc = pytest.mark.skipif(
+    os.environ.get("PYTHONMALLOC") != "malloc",
+    reason="memray only sees small allocations with PYTHONMALLOC=malloc",
+)
+
+
+def _per_game_budget(height: int) -> int:
+    return height * ROW_BYTES + OVERHEAD_BYTES
+
+
+def _pool_limit(height: int) -> str:
+    # One extra grid covers the transient array used while building a grid.
+    per_game = _per_game_budget(height) + ALLOCATOR_SLACK_BYTES
+    return f"{(POOL_SIZE * per_game + height * ROW_BYTES) / 1024:.1f} KB"
+
+
+def _game_bytes(game: TetrisGame) -> int:
+    return sys.getsizeof(game) + sys.getsizeof(game.board) + sys.getsizeof(game.grid)
+
+
+@pytest.mark.parametrize("height", HEIGHTS)
+def test_bytes_per_game(height, record_property):
+    """Record the bytes held per idle game and keep them within budget."""
+    pool = [TetrisGame(width=WIDTH, height=height) for _ in range(POOL_SIZE)]
+    per_game = sum(map(_game_bytes, pool)) / POOL_SIZE
+    record_property("bytes_per_game", per_game)
+    assert per_game <= _per_game_budget(height)
+
+
+@pytest.mark.memray
+@requires_malloc
+@pytest.mark.parametrize(
+    "height",
+    [pytest.param(height, marks=pytest.mark.limit_memory(_pool_limit(height))) for height in HEIGHTS],
+)
+def test_game_pool_memory_footprint(height):
+    """A pool of idle games should stay within the compact per-row budget."""
+    pool = [TetrisGame(width=WIDTH, height=height) for _ in range(POOL_SIZE)]
+    assert len(pool) == POOL_SIZE
+
+
+@pytest.mark.memray
+@pytest.mark.limit_memory("64 KB")
+def test_clear_lines_does_not_reallocate_grid():
+    """Clearing rows compacts the grid in place instead of rebuilding it."""
+    game = TetrisGame(width=WIDTH, height=10000)
+    for row in range(game.height - 100, game.height):
+        game.board.grid[row] = game.full_row_mask
+    assert game.clear_lines() == 100
+    assert game.calculate_height() == 0
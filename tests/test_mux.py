@@ -0,0 +1,129 @@
+import io
+
+import pytest
+
+from tetris.app import SessionTable, TetrisGame
+from tetris.mux import MultiplexApp, apply_records, parse_record, worker_for_key
+
+RECORDS = "g1:Q0\ng2:Q0\n\ng1:Q0\ng2:Q2,Q4,Q6,Q8\ng1:I0\n"
+EXPECTED = "g1:2\ng2:2\ng1:4\ng2:0\ng1:5\n"
+
+
+def run_mux(text, **kwargs):
+    output = io.StringIO()
+    MultiplexApp(**kwargs).process_stream(io.StringIO(text), output)
+    return output.getvalue()
+
+
+def test_parse_record():
+    assert parse_record("game42:T3,Q0") == ("game42", "T3,Q0")
+    assert parse_record(" g :") == ("g", "")
+    with pytest.raises(ValueError):
+        parse_record("T3,Q0")
+    with pytest.raises(ValueError):
+        parse_record(":T3")
+
+
+def test_worker_for_key_is_stable():
+    assert worker_for_key("game42", 4) == worker_for_key("game42", 4)
+    assert {worker_for_key(f"g{i}", 3) for i in range(100)} == {0, 1, 2}
+
+
+def test_apply_records_groups_by_key():
+    table = SessionTable()
+    results = apply_records(table, [(0, "a:Q0"), (1, "b:Q0"), (2, "a:Q0"), (3, "nokey")])
+    assert sorted(results) == [
+        (0, "a", "2", False),
+        (1, "b", "2", False),
+        (2, "a", "4", False),
+        (3, "", "Missing session key in record 'nokey'", True),
+    ]
+
+
+def test_failed_record_leaves_session_unchanged():
+    table = SessionTable(width=4, height=4)
+    results = apply_records(table, [(0, "a:Q0"), (1, "a:I0,Q0,Q0"), (2, "a:Q2")])
+    assert results == [
+        (0, "a", "2", False),
+        (1, "a", "No space to place tetromino", True),
+        (2, "a", "0", False),
+    ]
+
+
+def test_stop_on_error_drops_remaining_records_of_key():
+    table = SessionTable()
+    records = [(0, "a:X1"), (1, "b:Q0"), (2, "a:Q0")]
+    results = apply_records(table, records, stop_on_error=True)
+    assert sorted(results) == [
+        (0, "a", "Unknown tetromino type: X", True),
+        (1, "b", "2", False),
+    ]
+    assert table.get("a").board.calculate_height() == 0
+
+
+def test_abort_keeps_failing_key_at_last_written_height():
+    app = MultiplexApp()
+    output = io.StringIO()
+    with pytest.raises(ValueError):
+        app.process_stream(io.StringIO("a:Q0\na:X1\na:Q0\n"), output)
+    assert output.getvalue() == "a:2\n"
+    assert app.table is not None
+    assert app.table.get("a").board.calculate_height() == 2
+
+
+def test_session_table_only_in_process():
+    assert MultiplexApp().table is not None
+    assert MultiplexApp(workers=2).table is None
+
+
+def test_records_match_concatenated_history():
+    assert run_mux("g:S1,I0\ng:S0\n", width=4, height=50) == "g:2\ng:4\n"
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1024])
+def test_interleaved_games(batch_size):
+    assert run_mux(RECORDS, batch_size=batch_size) == EXPECTED
+
+
+def test_spilled_sessions_survive_eviction():
+    assert run_mux(RECORDS, batch_size=1, max_sessions=1) == EXPECTED
+
+
+def test_spilled_sessions_can_be_capped():
+    output = run_mux("a:Q0\nb:Q0\nc:Q0\na:Q0\n", batch_size=1, max_sessions=1, max_spilled=1)
+    assert output == "a:2\nb:2\nc:2\na:2\n"
+
+
+def test_workers_match_single_process():
+    assert run_mux(RECORDS, workers=2, batch_size=2) == EXPECTED
+
+
+def test_error_policies():
+    text = "a:Q0\na:X1\nbad\na:Q0\n"
+    with pytest.raises(ValueError):
+        run_mux(text)
+    assert run_mux(text, on_error="skip") == "a:2\na:4\n"
+    lines = run_mux(text, on_error="emit-error").splitlines()
+    assert lines[0] == "a:2"
+    assert lines[1] == "a:error: Unknown tetromino type: X"
+    assert lines[2].startswith(":error: Missing session key")
+    assert lines[3] == "a:4"
+
+
+class CrashingGame(TetrisGame):
+    __slots__ = ()
+
+    def process_chunk(self, line: str) -> int:
+        raise RuntimeError("engine crashed")
+
+
+def test_worker_crash_is_not_masked_by_shutdown():
+    with pytest.raises(EOFError):
+        run_mux(RECORDS, workers=2, factory=CrashingGame)
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        MultiplexApp(batch_size=0)
+    with pytest.raises(ValueError):
+        MultiplexApp(workers=-1)
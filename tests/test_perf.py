@@ -1,6 +1,7 @@
 import os
 import pytest
 from tetris.app import TetrisGame
+from tetris.engines import SkylineGame
 import glob
 
 RESOURCE_PATHS = sorted(glob.glob("./tests/resources/input*.txt")) or [
@@ -13,7 +14,7 @@ RESOURCE_PATHS = sorted(glob.glob("./tests/resources/input*.txt")) or [
 @pytest.mark.parametrize(
     "resource_path", RESOURCE_PATHS, ids=[os.path.basename(p) for p in RESOURCE_PATHS]
 )
-@pytest.mark.parametrize("klass", [TetrisGame], ids=["bitfield"])
+@pytest.mark.parametrize("klass", [TetrisGame, SkylineGame], ids=["bitfield", "skyline"])
 def test_tetris_benchmark_matrix(benchmark, klass, resource_path):
     with open(resource_path) as f:
         lines = [line.strip() for line in f if line.strip()]
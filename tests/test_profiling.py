@@ -0,0 +1,61 @@
+import io
+import pstats
+
+from tetris.cli import TetrisCLI
+from tetris.profiling import OTHER, PHASES, _builtin_name, profile_file
+
+INPUT = "tests/resources/input.txt"
+
+
+def test_profile_cpu_groups_time_by_phase(tmp_path):
+    pstats_path = tmp_path / "run.pstats"
+    report = profile_file(INPUT, top=3, pstats_path=str(pstats_path))
+    assert report.lines > 0
+    assert set(report.phase_times) <= {*PHASES, OTHER}
+    assert report.phase_times["landing search"] > 0
+    assert report.phase_times["tokenize"] > 0
+    assert report.peak_bytes is None
+    assert pstats.Stats(str(pstats_path)).get_stats_profile().func_profiles
+    text = report.format()
+    assert "landing search" in text
+    assert "Top 3 functions by own time" in text
+
+
+def test_builtin_names_match_exactly():
+    assert _builtin_name("<method 'write' of '_io.TextIOWrapper' objects>") == "write"
+    assert _builtin_name("<method 'acquire' of '_thread.RLock' objects>") == "acquire"
+    assert _builtin_name("<built-in method builtins.len>") == "len"
+    assert _builtin_name("<built-in method _thread.allocate_lock>") == "allocate_lock"
+
+
+def test_profile_memory_only():
+    report = profile_file(INPUT, cpu=False, memory=True)
+    assert report.stats is None
+    assert report.phase_times == {}
+    assert report.peak_bytes is not None
+    assert report.peak_bytes > 0
+    assert sum(report.phase_bytes.values()) > 0
+    assert report.peak_bytes >= sum(report.phase_bytes.values())
+    assert sum(report.phase_allocated.values()) > 0
+    text = report.format()
+    assert "Allocated (KiB)" in text
+    assert "Held at end (KiB)" in text
+    assert "Peak traced memory" in text
+
+
+def test_profile_memory_snapshot_interval():
+    per_line = profile_file(INPUT, cpu=False, memory=True, snapshot_interval=0)
+    default = profile_file(INPUT, cpu=False, memory=True)
+    assert sum(per_line.phase_allocated.values()) >= sum(default.phase_allocated.values()) > 0
+
+
+def test_cli_profile_subcommand():
+    args = TetrisCLI.parse_arguments(["--width", "12", "profile", INPUT, "--mode", "both"])
+    assert args.command == "profile"
+    assert args.input == INPUT
+    assert args.width == 12
+    assert TetrisCLI.parse_arguments([]).command is None
+
+    output = io.StringIO()
+    TetrisCLI(argv=["profile", INPUT, "--top", "2"], output_stream=output).run()
+    assert output.getvalue().startswith(f"Profile of {INPUT}")
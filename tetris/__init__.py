@@ -1,6 +1,7 @@
 import logging
 
-from tetris.app import TetrisApp, TetrisGame, Board, Tetromino, TetrominoType
+from tetris.app import TetrisApp, TetrisGame, Board, ErrorPolicy, SessionTable, Tetromino, TetrominoType
+from tetris.mux import MultiplexApp
 
 
 def configure_logging(log_level: int = logging.DEBUG) -> None:
@@ -26,4 +27,14 @@ def configure_logging(log_level: int = logging.DEBUG) -> None:
     logger.addHandler(fh)
 
 
-__all__ = ["TetrisApp", "TetrisGame", "Board", "Tetromino", "TetrominoType", "configure_logging"]
+__all__ = [
+    "TetrisApp",
+    "TetrisGame",
+    "Board",
+    "ErrorPolicy",
+    "MultiplexApp",
+    "SessionTable",
+    "Tetromino",
+    "TetrominoType",
+    "configure_logging",
+]
@@ -12,10 +12,23 @@ operations for collision detection and line clearing.
 
 from __future__ import annotations
 
-from typing import Optional, TextIO, Iterator
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    MutableSequence,
+    Optional,
+    Protocol,
+    TextIO,
+    cast,
+)
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
+import struct
 import sys
 
 logger = logging.getLogger(__name__)
@@ -99,44 +112,156 @@ class TetrominoType(Enum):
     J = Tetromino((0b01, 0b01, 0b11))  # J-shaped
 
 
+# Plain dict lookup is considerably cheaper than ``TetrominoType[name]`` on
+# the per-token parsing hot path.
+_TETROMINOES_BY_NAME = {member.name: member.value for member in TetrominoType}
+# Reverse lookup so debug logs show the shape letter rather than its rows.
+_TETROMINO_NAMES = {member.value: member.name for member in TetrominoType}
+
+
+class ErrorPolicy(str, Enum):
+    """How :class:`TetrisApp` reacts to a line that fails to process.
+
+    ``ABORT`` re-raises the error and stops the run, ``SKIP`` logs the
+    error and moves on to the next line, and ``EMIT_ERROR`` writes an
+    ``error: <message>`` record in place of the height.
+    """
+
+    ABORT = "abort"
+    SKIP = "skip"
+    EMIT_ERROR = "emit-error"
+
 
 _BITS_TO_CHARS = str.maketrans("10", "O ")
 
+# Unsigned array typecodes ordered by item size. Boards up to 64 columns
+# store their rows in the narrowest typecode that fits the width, which
+# keeps a row at 1-8 bytes instead of a 28+ byte Python int plus an
+# 8-byte list slot.
+_ROW_TYPECODES = tuple(sorted("BHIQ", key=lambda code: array(code).itemsize))
+
+Grid = MutableSequence[int]
+
+# Serialized board layout (little-endian): magic, format version, width,
+# height and stack height, followed by ``stack height`` rows of
+# ``ceil(width / 8)`` bytes each, top row first. Empty rows above the
+# stack are implied by the header and never stored.
+_BOARD_MAGIC = b"TB"
+_BOARD_VERSION = 1
+_BOARD_HEADER = struct.Struct("<2sBHII")
+
+# Sentinel for a stack top that must be rescanned after direct grid access.
+_STALE_TOP = -1
+
+
+def _packable(grid: array, row_bytes: int) -> bool:
+    """Whether the memory of ``grid`` already matches the serialized row layout."""
+    return sys.byteorder == "little" and grid.itemsize == row_bytes
+
+
+class RowArray(array):
+    """Compact array of row bitfields that compares like a list of ints.
+
+    Plain :class:`array.array` never equals a ``list``; grids used to be
+    lists, so equality with a list of rows is kept for compatibility.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, list):
+            return self.tolist() == other
+        return array.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def _row_typecode(width: int) -> Optional[str]:
+    """Return the narrowest array typecode able to hold ``width`` bits.
+
+    Returns ``None`` for boards wider than 64 columns, which fall back to
+    a list of Python ints.
+    """
+    for code in _ROW_TYPECODES:
+        if array(code).itemsize * 8 >= width:
+            return code
+    return None
 
-@dataclass
+
+@dataclass(slots=True)
 class Board:
     """Encapsulates the Tetris board state and operations.
 
     This class centralises grid manipulation, collision detection,
     placement and line clearing logic so the game class can remain a
     thin coordinator.
+
+    The grid is a mutable sequence of row bitfields exposed through the
+    ``grid`` property. Boards of width 64 or less use a compact
+    :class:`RowArray`; wider boards use a list of Python ints. Either
+    compares equal to a list holding the same rows.
+
+    The board tracks the top of its stack so height queries do not scan
+    the grid. ``grid`` is live and may be written directly: every access
+    to it marks the tracked top stale, and the next query rescans. A
+    reference to the grid kept across board operations should be fetched
+    again through ``grid`` before writing to it.
     """
 
     width: int = 10
     height: int = 100
     _full_row_mask: int = field(init=False)
-    grid: list[int] = field(init=False, repr=False)
+    _typecode: Optional[str] = field(init=False, repr=False)
+    _grid: Grid = field(init=False, repr=False)
+    # Index of the topmost occupied row, ``height`` when the board is
+    # empty, or ``_STALE_TOP`` when it must be rescanned.
+    _top: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.width <= 0 or self.height <= 0:
             raise ValueError("Width and height must be positive integers")
         self._full_row_mask = (1 << self.width) - 1
-        self.grid = self.create_grid()
+        self._typecode = _row_typecode(self.width)
+        self._grid = self.create_grid()
+        self._top = self.height
+
+    @property
+    def grid(self) -> Grid:
+        """The row bitfields from top to bottom.
+
+        The grid may be modified in place, so accessing it marks the
+        tracked stack top stale.
+        """
+        self._top = _STALE_TOP
+        return self._grid
 
-    def create_grid(self) -> list[int]:
+    @grid.setter
+    def grid(self, rows: Grid) -> None:
+        self._grid = rows
+        self._top = _STALE_TOP
+
+    def create_grid(self) -> Grid:
         """Return a freshly zeroed grid.
 
-        Returns a list of integer rows initialised to ``0`` with length
+        Returns a sequence of integer rows initialised to ``0`` with length
         equal to ``self.height``.
         """
-        return [0] * self.height
+        if self._typecode is None:
+            return [0] * self.height
+        # Repeating a one-item array sizes the buffer exactly; in-place
+        # repetition on the subclass would over-allocate.
+        return RowArray(self._typecode, array(self._typecode, (0,)) * self.height)
 
     def reset(self) -> None:
         """Reset the board grid to an empty state.
 
-        This replaces ``self.grid`` with a newly created zeroed grid.
+        This replaces the grid with a newly created zeroed grid.
         """
-        self.grid = self.create_grid()
+        self._grid = self.create_grid()
+        self._top = self.height
 
     def print_grid(self) -> None:
         """Log a human-readable representation of the grid at DEBUG level.
@@ -148,7 +273,7 @@ class Board:
         if not logger.isEnabledFor(logging.DEBUG):
             return
         logger.debug("Current grid state:")
-        for row in self.grid:
+        for row in self._grid:
             bits = format(row, f"0{self.width}b")
             logger.debug(bits.translate(_BITS_TO_CHARS))
 
@@ -172,11 +297,13 @@ class Board:
             True if any tetromino cell would be out of bounds or overlap an
             occupied board cell; False otherwise.
         """
-        for i, tetromino_row in enumerate(tetromino):
+        grid = self._grid
+        height = self.height
+        for i, tetromino_row in enumerate(tetromino.rows):
             board_row_idx = start_row + i
-            if board_row_idx >= self.height:
+            if board_row_idx >= height:
                 return True
-            if self.grid[board_row_idx] & (tetromino_row << shift):
+            if grid[board_row_idx] & (tetromino_row << shift):
                 return True
         return False
 
@@ -197,7 +324,7 @@ class Board:
             If the tetromino does not fit horizontally at the requested
             column or there is no vertical space to place it.
         """
-        tetromino_height, tetromino_width = tetromino.height, tetromino.width
+        tetromino_width = tetromino.width
 
         shift = self.width - tetromino_width - column
         if shift < 0:
@@ -205,26 +332,33 @@ class Board:
                 "Tetromino of width %d does not fit at column %d in grid of "
                 "width %d" % (tetromino_width, column, self.width)
             )
-        max_start_row = self.height - tetromino_height
-
-        # Find first row that would collide; landing row is the previous one.
-        for row in range(0, max_start_row + 1):
-            if self._check_collision(tetromino, row, shift):
-                break
-        else:
-            # No collision until beyond the last possible start row.
-            row = max_start_row + 1
-
-        landing_row = row - 1
+        landing_row = self._landing_row(tetromino, shift)
         if landing_row < 0:
             logger.debug("Cannot place new tetromino: no space")
             raise ValueError("No space to place tetromino")
 
-        for i, tetromino_row in enumerate(tetromino):
-            self.grid[landing_row + i] |= tetromino_row << shift
+        grid = self._grid
+        for i, tetromino_row in enumerate(tetromino.rows):
+            grid[landing_row + i] |= tetromino_row << shift
+        if landing_row < self._top:
+            self._top = landing_row
 
         self.print_grid()
 
+    def _landing_row(self, tetromino: Tetromino, shift: int) -> int:
+        """Return the row where ``tetromino`` comes to rest when dropped.
+
+        The result is the index of the board row aligned with the
+        tetromino's top row, or ``-1`` when it collides immediately.
+        """
+        max_start_row = self.height - tetromino.height
+
+        # Find first row that would collide; landing row is the previous one.
+        for row in range(0, max_start_row + 1):
+            if self._check_collision(tetromino, row, shift):
+                return row - 1
+        # No collision until beyond the last possible start row.
+        return max_start_row
 
     def clear_lines(self) -> int:
         """Remove any full rows from the board and return the count.
@@ -233,26 +367,141 @@ class Board:
         prepended to preserve the board height.
         """
         mask = self._full_row_mask
-        cleared = sum(1 for row in self.grid if row == mask)
+        grid = self._grid
+        cleared = grid.count(mask)
         if cleared == 0:
             return 0
-        # Prepend empty rows and keep the existing non-full ones; this mirrors
-        # the original behaviour while being explicit about the transformation.
-        self.grid = [0] * cleared + [row for row in self.grid if row != mask]
+        # Compact the non-full rows towards the bottom in place and zero the
+        # freed rows at the top, avoiding a second grid-sized allocation.
+        write = top = self.height
+        for read in range(self.height - 1, -1, -1):
+            row = grid[read]
+            if row != mask:
+                write -= 1
+                grid[write] = row
+                if row:
+                    top = write
+        for i in range(write):
+            grid[i] = 0
+        self._top = top
         return cleared
 
     def calculate_height(self) -> int:
         """Compute the height of the stacked blocks.
 
         The height is the number of non-empty rows measured from the bottom
-        of the board. Returns ``0`` when the board is empty.
+        of the board. Returns ``0`` when the board is empty. The stack top
+        is tracked by the board's own methods; the grid is only rescanned
+        after direct access through ``grid``.
+        """
+        return self.height - self._stack_top()
+
+    def _stack_top(self) -> int:
+        """Return the index of the topmost occupied row, rescanning if stale."""
+        top = self._top
+        if top == _STALE_TOP:
+            top = self._top = self._find_top()
+        return top
+
+    def _find_top(self, start: int = 0) -> int:
+        """Scan for the topmost occupied row at or below row ``start``."""
+        grid = self._grid
+        if isinstance(grid, array):
+            # Strip the empty rows above the stack at C speed: the first
+            # non-zero byte always lies within the top occupied row.
+            itemsize = grid.itemsize
+            occupied = len(memoryview(grid)[start:].tobytes().lstrip(b"\0"))
+            return self.height - (occupied + itemsize - 1) // itemsize
+        return next((i for i in range(start, self.height) if grid[i]), self.height)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the board into the compact binary board format.
+
+        Only the occupied rows are stored, packed into ``ceil(width / 8)``
+        little-endian bytes each, behind a fixed header carrying width,
+        height and stack height. The result round-trips exactly through
+        :meth:`from_bytes`.
+        """
+        if self.width > 0xFFFF:
+            raise ValueError("Board width %d too large to serialize" % self.width)
+        stack = self.calculate_height()
+        start = self.height - stack
+        header = _BOARD_HEADER.pack(_BOARD_MAGIC, _BOARD_VERSION, self.width, self.height, stack)
+        row_bytes = (self.width + 7) // 8
+        grid = self._grid
+        if isinstance(grid, array) and _packable(grid, row_bytes):
+            return header + memoryview(grid)[start:].tobytes()
+        return header + b"".join(
+            grid[i].to_bytes(row_bytes, "little") for i in range(start, self.height)
+        )
+
+    def load(self, data: bytes | bytearray | memoryview) -> None:
+        """Replace the board contents with a serialized board.
+
+        ``data`` may be any buffer, including a ``memoryview`` over an
+        ``mmap``; rows are copied straight from it into the grid without
+        intermediate objects when the grid layout allows. The serialized
+        width and height must match this board.
+
+        Raises
+        ------
+        ValueError
+            If ``data`` is not a valid serialized board for this size.
         """
-        return next((self.height - i for i, row in enumerate(self.grid) if row), 0)
+        view = memoryview(data).cast("B")
+        width, height, stack = _unpack_board_header(view)
+        if (width, height) != (self.width, self.height):
+            raise ValueError(
+                "Serialized board is %dx%d, expected %dx%d"
+                % (width, height, self.width, self.height)
+            )
+        row_bytes = (width + 7) // 8
+        rows = view[_BOARD_HEADER.size : _BOARD_HEADER.size + stack * row_bytes]
+        start = height - stack
+        self.reset()
+        grid = self._grid
+        if isinstance(grid, array) and _packable(grid, row_bytes):
+            memoryview(grid).cast("B")[start * row_bytes :] = rows
+        else:
+            for i, offset in enumerate(range(0, stack * row_bytes, row_bytes), start):
+                grid[i] = int.from_bytes(rows[offset : offset + row_bytes], "little")
+        self._top = self._find_top(start)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> Board:
+        """Create a board from data produced by :meth:`to_bytes`."""
+        width, height, _ = _unpack_board_header(memoryview(data).cast("B"))
+        board = cls(width=width, height=height)
+        board.load(data)
+        return board
+
+    def __reduce__(self) -> tuple:
+        # Pickle through the compact format so boards move between
+        # processes as a few bytes rather than ``height`` Python ints.
+        return (type(self).from_bytes, (self.to_bytes(),))
+
+
+def _unpack_board_header(view: memoryview) -> tuple[int, int, int]:
+    """Validate a serialized board and return ``(width, height, stack)``."""
+    if len(view) < _BOARD_HEADER.size:
+        raise ValueError("Serialized board is truncated")
+    magic, version, width, height, stack = _BOARD_HEADER.unpack_from(view)
+    if magic != _BOARD_MAGIC:
+        raise ValueError("Not a serialized board")
+    if version != _BOARD_VERSION:
+        raise ValueError("Unsupported board format version %d" % version)
+    if width <= 0 or height <= 0 or stack > height:
+        raise ValueError("Invalid board dimensions in header")
+    if len(view) != _BOARD_HEADER.size + stack * ((width + 7) // 8):
+        raise ValueError("Serialized board length does not match its header")
+    return width, height, stack
 
 
 class TetrisGame:
     """A Tetris game implementation using bitfield representation."""
 
+    __slots__ = ("board",)
+
     def __init__(self, width: int = 10, height: int = 100) -> None:
         """Initialise a TetrisGame with a backing Board.
 
@@ -265,8 +514,7 @@ class TetrisGame:
         """
         self.board = Board(width=width, height=height)
 
-
-    def create_grid(self) -> list[int]:
+    def create_grid(self) -> Grid:
         """Return a freshly zeroed grid matching the board height.
 
         This is a thin delegate to :meth:`Board.create_grid` kept for
@@ -285,8 +533,8 @@ class TetrisGame:
         return self.board.height
 
     @property
-    def grid(self) -> list[int]:
-        """The underlying board grid (read-only view)."""
+    def grid(self) -> Grid:
+        """The live board grid; see :attr:`Board.grid`."""
         return self.board.grid
 
     @property
@@ -365,30 +613,239 @@ class TetrisGame:
         except ValueError as exc:
             raise ValueError("Invalid column in placement '%s' at step %d" % (item, idx)) from exc
 
-        try:
-            tetromino = TetrominoType[shape].value
-        except KeyError:
+        tetromino = _TETROMINOES_BY_NAME.get(shape)
+        if tetromino is None:
             raise ValueError("Unknown tetromino type: %s" % shape)
 
         return tetromino, column
 
-    def process_input_line(self, line: str) -> int:
-        """Process a comma-separated placement line and return board height.
+    def validate_line(self, line: str) -> list[tuple[Tetromino, int]]:
+        """Parse and validate a whole placement line without touching the board.
 
-        The line is split on commas. Each non-empty token is parsed as a
-        placement and applied sequentially. After all placements are
-        applied any full lines are cleared and the resulting board height
-        (number of occupied rows from the bottom) is returned.
+        Every token is checked for syntax, a known shape and a column that
+        keeps the tetromino inside the board horizontally. Returns the
+        parsed ``(Tetromino, column)`` pairs in order so callers can apply
+        them without re-parsing.
+
+        Raises
+        ------
+        ValueError
+            On the first malformed or out-of-range placement.
         """
+        placements = []
+        width = self.board.width
         for idx, item in enumerate(filter(None, map(str.strip, line.split(","))), 1):
             tetromino, column = self._parse_placement(item, idx)
-            logger.debug("Step %d: place %s at %d", idx, item[0], column)
+            if column < 0 or column + tetromino.width > width:
+                raise ValueError(
+                    "Column %d out of range in placement '%s' at step %d"
+                    % (column, item, idx)
+                )
+            placements.append((tetromino, column))
+        return placements
+
+    def process_input_line(self, line: str) -> int:
+        """Process a comma-separated placement line and return board height.
+
+        The whole line is validated up front with :meth:`validate_line` so
+        malformed input fails before any board work. The placements are
+        then applied sequentially. After all placements are applied any
+        full lines are cleared and the resulting board height (number of
+        occupied rows from the bottom) is returned.
+        """
+        for idx, (tetromino, column) in enumerate(self.validate_line(line), 1):
+            logger.debug(
+                "Step %d: place %s at %d", idx, _TETROMINO_NAMES.get(tetromino, tetromino), column
+            )
             self.place_tetromino(tetromino, column)
 
         cleared = self.clear_lines()
         logger.debug("Cleared rows: %d", cleared)
         return self.calculate_height()
 
+    def process_line(self, line: str) -> int:
+        """Apply a placement line to the current board and return its height.
+
+        Engine-interface name for :meth:`process_input_line`; the board is
+        not reset first.
+        """
+        return self.process_input_line(line)
+
+    def process_chunk(self, line: str) -> int:
+        """Apply a placement line as the next chunk of a continuing game.
+
+        Unlike :meth:`process_input_line` full rows stay on the board, so
+        a game fed in chunks evolves exactly like one processing the
+        concatenated history in a single line. The returned height is the
+        one that history would report once its full rows are cleared. A
+        chunk that fails part-way is rolled back, leaving the board as it
+        was before the chunk.
+        """
+        placements = self.validate_line(line)
+        board = self.board
+        grid = board._grid
+        snapshot = grid[:]
+        try:
+            for idx, (tetromino, column) in enumerate(placements, 1):
+                logger.debug(
+                    "Step %d: place %s at %d",
+                    idx,
+                    _TETROMINO_NAMES.get(tetromino, tetromino),
+                    column,
+                )
+                self.place_tetromino(tetromino, column)
+        except ValueError:
+            grid[:] = snapshot
+            board.grid = grid
+            raise
+        return self.calculate_height() - grid.count(board._full_row_mask)
+
+    def batch_process(self, lines: Iterable[str]) -> list[int]:
+        """Process each line on a freshly reset board and return the heights."""
+        heights = []
+        for line in lines:
+            self.reset()
+            heights.append(self.process_input_line(line))
+        return heights
+
+
+class Engine(Protocol):
+    """Interface shared by :class:`TetrisGame` and interchangeable engines.
+
+    :class:`TetrisApp`, :class:`SessionTable` and the multiplexer accept
+    any engine; see :mod:`tetris.engines` for the registry.
+    """
+
+    @property
+    def width(self) -> int: ...
+
+    @property
+    def height(self) -> int: ...
+
+    @property
+    def board(self) -> Board: ...
+
+    @property
+    def grid(self) -> Grid: ...
+
+    def reset(self) -> None:
+        """Reset the board to an empty state."""
+        ...
+
+    def process_line(self, line: str) -> int:
+        """Apply a placement line to the current board and return its height."""
+        ...
+
+    def process_chunk(self, line: str) -> int:
+        """Apply a placement line as the next chunk of a continuing game."""
+        ...
+
+    def batch_process(self, lines: Iterable[str]) -> list[int]:
+        """Process each line on a freshly reset board and return the heights."""
+        ...
+
+
+EngineFactory = Callable[[int, int], Engine]
+
+
+class SessionTable:
+    """Bounded table of live games keyed by session id.
+
+    Games are created on first use and kept in least-recently-used order.
+    When the table grows beyond ``max_sessions`` the least recently used
+    game is evicted. By default its state is discarded; with
+    ``spill=True`` the board is serialized with :meth:`Board.to_bytes`
+    and restored transparently on the next access. New games are built by
+    ``factory(width, height)``.
+
+    Spilled boards are unbounded by default, so memory still grows with
+    every distinct key seen. ``max_spilled`` caps them; beyond it the
+    oldest spilled session is discarded.
+    """
+
+    __slots__ = (
+        "width",
+        "height",
+        "max_sessions",
+        "spill",
+        "max_spilled",
+        "factory",
+        "_games",
+        "_spilled",
+    )
+
+    def __init__(
+        self,
+        width: int = 10,
+        height: int = 100,
+        max_sessions: int = 1024,
+        *,
+        spill: bool = False,
+        max_spilled: Optional[int] = None,
+        factory: EngineFactory = TetrisGame,
+    ) -> None:
+        if max_sessions <= 0:
+            raise ValueError("max_sessions must be a positive integer")
+        if max_spilled is not None and max_spilled < 0:
+            raise ValueError("max_spilled must not be negative")
+        self.width = width
+        self.height = height
+        self.max_sessions = max_sessions
+        self.spill = spill
+        self.max_spilled = max_spilled
+        self.factory = factory
+        self._games: OrderedDict[Hashable, Engine] = OrderedDict()
+        self._spilled: dict[Hashable, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._games or key in self._spilled
+
+    @property
+    def spilled(self) -> int:
+        """Number of sessions currently held in packed form."""
+        return len(self._spilled)
+
+    def get(self, key: Hashable) -> Engine:
+        """Return the game for ``key``, creating or restoring it on a miss.
+
+        Marks the session as most recently used and evicts the least
+        recently used session if the table is over capacity.
+        """
+        games = self._games
+        game = games.get(key)
+        if game is not None:
+            games.move_to_end(key)
+            return game
+        game = games[key] = self.factory(self.width, self.height)
+        packed = self._spilled.pop(key, None)
+        if packed is not None:
+            game.board.load(packed)
+        if len(games) > self.max_sessions:
+            evicted, evicted_game = games.popitem(last=False)
+            if self.spill:
+                spilled = self._spilled
+                spilled[evicted] = evicted_game.board.to_bytes()
+                if self.max_spilled is not None and len(spilled) > self.max_spilled:
+                    dropped = next(iter(spilled))
+                    del spilled[dropped]
+                    logger.debug("Dropped spilled session %r", dropped)
+            logger.debug("Evicted session %r", evicted)
+        return game
+
+    def pop(self, key: Hashable) -> Optional[Engine]:
+        """Remove and return the game for ``key`` if present."""
+        if key in self._spilled:
+            self.get(key)
+        return self._games.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every session, including spilled ones."""
+        self._games.clear()
+        self._spilled.clear()
+
 
 class TetrisApp:
     """Application coordinator for running Tetris via streams.
@@ -396,49 +853,87 @@ class TetrisApp:
     This class improves testability by allowing the caller to inject
     input and output streams and a custom TetrisGame. The constructor
     keeps the familiar width/height parameters for simple CLI usage.
+
+    With ``persistent=True`` the board is not reset between lines, so each
+    line is applied as the next chunk of one continuous game (see
+    :meth:`TetrisGame.process_chunk`). Keyed sessions passed to
+    :meth:`process_line` always persist and live in a bounded
+    :class:`SessionTable` of ``max_sessions`` games.
     """
 
-    __slots__ = ("game", "input_stream", "output_stream")
+    __slots__ = ("game", "input_stream", "output_stream", "on_error", "persistent", "sessions")
 
     def __init__(
         self,
         width: int = 10,
         height: int = 100,
         *,
-        game: Optional[TetrisGame] = None,
+        game: Optional[Engine] = None,
         input_stream: TextIO = sys.stdin,
         output_stream: TextIO = sys.stdout,
+        on_error: ErrorPolicy | str = ErrorPolicy.ABORT,
+        persistent: bool = False,
+        max_sessions: int = 1024,
     ) -> None:
         # Maintain CLI-friendly signature while preferring an injected
         # TetrisGame when provided.
         self.game = game or TetrisGame(width=width, height=height)
         self.input_stream = input_stream
         self.output_stream = output_stream
+        self.on_error = ErrorPolicy(on_error)
+        self.persistent = persistent
+        # Keyed sessions run on the same engine class as the default game.
+        factory = cast(EngineFactory, type(self.game))
+        self.sessions = SessionTable(
+            self.game.width, self.game.height, max_sessions, factory=factory
+        )
 
-    def process_line(self, line: str) -> int:
-        """Reset the game and process a single placement line.
+    def process_line(self, line: str, session_id: Optional[Hashable] = None) -> int:
+        """Process a single placement line and return the board height.
 
-        Returns the board height after processing the placements.
+        Without ``session_id`` the default game is used and reset first
+        unless the app is persistent. With ``session_id`` the placements
+        are applied on top of that session's board, which is created on
+        first use. Persistent and keyed boards take each line as a chunk
+        and report the height of the concatenated history.
         """
+        if session_id is not None:
+            return self.sessions.get(session_id).process_chunk(line)
+        if self.persistent:
+            return self.game.process_chunk(line)
         self.game.reset()
-        return self.game.process_input_line(line)
+        return self.game.process_line(line)
 
     def process_stream(self, reader: Optional[TextIO] = None, writer: Optional[TextIO] = None) -> None:
         """Process lines from ``reader`` and write results to ``writer``.
 
         Blank lines are ignored. For each non-empty input line the game is
-        reset, the placements processed and the resulting height is written
-        to the output followed by a newline.
+        reset (unless the app is persistent), the placements processed and
+        the resulting height is written to the output followed by a
+        newline. Lines that fail to process are handled according to
+        :attr:`on_error`.
         """
         reader = reader or self.input_stream
         writer = writer or self.output_stream
+        on_error = self.on_error
 
-        for line in reader:
+        for lineno, line in enumerate(reader, 1):
             line = line.strip()
             if not line:
                 continue
-            height = self.process_line(line)
+            try:
+                height = self.process_line(line)
+            except ValueError as exc:
+                if on_error is ErrorPolicy.ABORT:
+                    raise
+                logger.warning("Line %d: %s", lineno, exc)
+                if on_error is ErrorPolicy.EMIT_ERROR:
+                    writer.write(f"error: {exc}\n")
+                continue
             writer.write(f"{height}\n")
+            if self.persistent:
+                # Live sessions expect each delta as soon as it is applied.
+                writer.flush()
 
     def run(self) -> None:
         """Run the application using the configured input and output.
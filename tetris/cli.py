@@ -1,8 +1,13 @@
 import argparse
+import os
+import stat
 
 import sys
 
-from tetris import TetrisApp, configure_logging
+from tetris import ErrorPolicy, MultiplexApp, TetrisApp, configure_logging
+from tetris.engines import AUTO, ENGINES, REFERENCE, EngineFactory, get_engine, select_engine
+from tetris.fuzz import fuzz
+from tetris.profiling import profile_file
 from typing import Iterable, Optional, TextIO, List
 
 
@@ -34,14 +39,134 @@ class TetrisCLI:
         parser.add_argument("--width", type=int, default=10, help="Grid width")
         parser.add_argument("--height", type=int, default=100, help="Grid height")
         parser.add_argument("--log-level", type=int, default=50, help="Log level")
+        parser.add_argument(
+            "--on-error",
+            choices=[policy.value for policy in ErrorPolicy],
+            default=ErrorPolicy.ABORT.value,
+            help="How to handle a line that fails to process",
+        )
+        parser.add_argument(
+            "--persistent",
+            action="store_true",
+            help="Keep the board across lines instead of resetting it",
+        )
+        parser.add_argument(
+            "--multiplex",
+            action="store_true",
+            help="Read interleaved '<key>:<placements>' records for many games",
+        )
+        parser.add_argument(
+            "--max-sessions",
+            type=int,
+            default=1024,
+            help="Live games kept per process for --multiplex before spilling",
+        )
+        parser.add_argument(
+            "--max-spilled",
+            type=int,
+            default=None,
+            help="Spilled games kept for --multiplex before the oldest are dropped "
+            "(default: unbounded)",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=0, help="Worker processes for --multiplex"
+        )
+        parser.add_argument(
+            "--engine",
+            choices=[*ENGINES, AUTO],
+            default=REFERENCE,
+            help="Game engine; 'auto' picks the fastest after a cached calibration run",
+        )
+        subparsers = parser.add_subparsers(dest="command")
+        profile = subparsers.add_parser(
+            "profile", help="Profile an input file and report time and memory per engine phase"
+        )
+        profile.add_argument("input", help="Placement input file to profile")
+        profile.add_argument(
+            "--mode",
+            choices=["cpu", "memory", "both"],
+            default="cpu",
+            help="Run under cProfile, tracemalloc or both",
+        )
+        profile.add_argument("--top", type=int, default=10, help="Number of hot functions to list")
+        profile.add_argument("--pstats", help="Write raw cProfile data to this file")
+        fuzz = subparsers.add_parser(
+            "fuzz", help="Check every registered engine against the reference engine"
+        )
+        fuzz.add_argument("--cases", type=int, default=1000, help="Number of random cases")
+        fuzz.add_argument("--seed", type=int, default=0, help="Random seed")
         return parser.parse_args(argv)
 
+    @staticmethod
+    def _input_size(stream: TextIO) -> Optional[int]:
+        """Return the byte size of ``stream`` if it is a regular file."""
+        try:
+            info = os.fstat(stream.fileno())
+        except (AttributeError, OSError, ValueError):
+            return None
+        return info.st_size if stat.S_ISREG(info.st_mode) else None
+
+    def resolve_engine(self) -> EngineFactory:
+        """Return the engine factory selected by ``--engine``."""
+        args = self.args
+        name = getattr(args, "engine", REFERENCE)
+        if name == AUTO:
+            if getattr(args, "command", None) == "profile":
+                size = os.path.getsize(args.input)
+            else:
+                size = self._input_size(self.input_stream)
+            name = select_engine(args.width, args.height, size)
+        return get_engine(name)
+
     def run(self) -> None:
         """Configure logging, create the app and process input/output streams."""
         kwargs = vars(self.args).copy()
         log_level = kwargs.pop("log_level")
         configure_logging(log_level)
-        app = TetrisApp(width=kwargs.get("width", 10), height=kwargs.get("height", 100), input_stream=self.input_stream, output_stream=self.output_stream)
+        if kwargs.get("command") == "fuzz":
+            fuzz_report = fuzz(cases=kwargs["cases"], seed=kwargs["seed"])
+            self.output_stream.write(fuzz_report.format())
+            if not fuzz_report.ok:
+                raise SystemExit(1)
+            return
+        factory = self.resolve_engine()
+        if kwargs.get("command") == "profile":
+            report = profile_file(
+                kwargs["input"],
+                kwargs["width"],
+                kwargs["height"],
+                cpu=kwargs["mode"] in ("cpu", "both"),
+                memory=kwargs["mode"] in ("memory", "both"),
+                top=kwargs["top"],
+                pstats_path=kwargs["pstats"],
+                factory=factory,
+            )
+            self.output_stream.write(report.format())
+            return
+        if kwargs.get("multiplex"):
+            app = MultiplexApp(
+                width=kwargs["width"],
+                height=kwargs["height"],
+                input_stream=self.input_stream,
+                output_stream=self.output_stream,
+                on_error=kwargs["on_error"],
+                max_sessions=kwargs["max_sessions"],
+                max_spilled=kwargs["max_spilled"],
+                workers=kwargs["workers"],
+                factory=factory,
+            )
+            app.run()
+            return
+        width, height = kwargs.get("width", 10), kwargs.get("height", 100)
+        app = TetrisApp(
+            width=width,
+            height=height,
+            game=factory(width, height),
+            input_stream=self.input_stream,
+            output_stream=self.output_stream,
+            on_error=kwargs.get("on_error", ErrorPolicy.ABORT.value),
+            persistent=kwargs.get("persistent", False),
+        )
         app.run()
 
 
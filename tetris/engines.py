@@ -0,0 +1,291 @@
+"""Registry of interchangeable Tetris engines.
+
+An engine is any object built from ``(width, height)`` that implements
+the :class:`~tetris.app.Engine` interface. The reference engine is
+:class:`~tetris.app.TetrisGame` itself; optimized variants register under
+their own names so they can be selected at run time and verified against
+it (see :mod:`tetris.fuzz`).
+
+:func:`select_engine` implements ``auto`` selection: a short calibration
+run times every registered engine on a synthetic workload scaled to the
+board and input size, discards any engine whose results disagree with the
+reference, and caches the fastest engine's name on disk.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+import json
+import logging
+import math
+import os
+import random
+import time
+
+from tetris.app import Board, EngineFactory, Tetromino, TetrisGame, TetrominoType
+
+logger = logging.getLogger(__name__)
+
+REFERENCE = "reference"
+AUTO = "auto"
+
+# Calibration workload for inputs of unknown size, and the bounds applied
+# when it is scaled to a size bucket. Placement tokens such as ``"T3,"``
+# average about three bytes of input. A reference placement may scan every
+# row of the board, so the workload is also capped in placements times
+# board height.
+CALIBRATION_LINES = 50
+CALIBRATION_TOKENS = 20
+_BYTES_PER_TOKEN = 3
+_MAX_CALIBRATION_PLACEMENTS = 10_000
+_MAX_CALIBRATION_CELLS = 500_000
+_MAX_CALIBRATION_TOKENS = 100
+
+# Seconds each engine is timed for, and the number of leading workload
+# lines on which its results must agree with the reference.
+CALIBRATION_BUDGET = 0.2
+CALIBRATION_CHECK_LINES = 5
+
+
+@dataclass(slots=True)
+class SkylineBoard(Board):
+    """Board that starts landing searches at the top of its stack.
+
+    The reference landing search scans down from row ``0``. Every row
+    above the stack is empty, so no start row ending above it can
+    collide; this board starts the scan just above the tracked stack top
+    instead, which yields the same landing row in time proportional to
+    the stack depth rather than the board height.
+    """
+
+    def _landing_row(self, tetromino: Tetromino, shift: int) -> int:
+        max_start_row = self.height - tetromino.height
+        for row in range(max(0, self._stack_top() - tetromino.height), max_start_row + 1):
+            if self._check_collision(tetromino, row, shift):
+                return row - 1
+        return max_start_row
+
+
+class SkylineGame(TetrisGame):
+    """TetrisGame backed by a :class:`SkylineBoard`."""
+
+    __slots__ = ()
+
+    def __init__(self, width: int = 10, height: int = 100) -> None:
+        self.board = SkylineBoard(width=width, height=height)
+
+
+ENGINES: dict[str, EngineFactory] = {REFERENCE: TetrisGame, "skyline": SkylineGame}
+
+
+def register_engine(name: str, factory: EngineFactory) -> None:
+    """Register ``factory`` under ``name``.
+
+    Raises
+    ------
+    ValueError
+        If ``name`` is already registered or reserved.
+    """
+    if name in ENGINES or name == AUTO:
+        raise ValueError("Engine already registered: %s" % name)
+    ENGINES[name] = factory
+
+
+def unregister_engine(name: str) -> None:
+    """Remove a previously registered engine.
+
+    The reference engine cannot be removed.
+    """
+    if name == REFERENCE:
+        raise ValueError("The reference engine cannot be unregistered")
+    ENGINES.pop(name, None)
+
+
+def get_engine(name: str) -> EngineFactory:
+    """Return the factory registered under ``name``.
+
+    Raises
+    ------
+    ValueError
+        If no engine is registered under ``name``.
+    """
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError("Unknown engine: %s" % name)
+
+
+def default_cache_path() -> str:
+    """Return the calibration cache file under the user cache directory."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "tetromino", "engines.json")
+
+
+def size_bucket(input_size: Optional[int]) -> str:
+    """Return the cache bucket for an input of ``input_size`` bytes.
+
+    Sizes are bucketed by order of magnitude; unknown sizes (e.g. pipes)
+    share a single ``stream`` bucket.
+    """
+    if input_size is None:
+        return "stream"
+    return f"1e{_magnitude(input_size)}"
+
+
+def _magnitude(input_size: int) -> int:
+    return int(math.log10(input_size)) if input_size > 0 else 0
+
+
+def calibration_workload(input_size: Optional[int], height: int = 100) -> tuple[int, int]:
+    """Return ``(lines, tokens per line)`` to calibrate for ``input_size`` bytes.
+
+    The workload is sized to the input's :func:`size_bucket` rather than
+    the exact size, so every input sharing a cache entry is calibrated
+    alike. Its placement count follows the bucket and is split into
+    roughly as many lines as tokens per line. Unknown sizes use
+    :data:`CALIBRATION_LINES` lines of :data:`CALIBRATION_TOKENS` tokens.
+    Either way the placements are bounded, more tightly on tall boards,
+    to keep calibration short.
+    """
+    limit = max(min(_MAX_CALIBRATION_PLACEMENTS, _MAX_CALIBRATION_CELLS // height), 1)
+    if input_size is None:
+        if CALIBRATION_LINES * CALIBRATION_TOKENS <= limit:
+            return CALIBRATION_LINES, CALIBRATION_TOKENS
+        placements = limit
+    else:
+        placements = min(max(10 ** _magnitude(input_size) // _BYTES_PER_TOKEN, 1), limit)
+    tokens = min(max(math.isqrt(placements), 1), _MAX_CALIBRATION_TOKENS)
+    return placements // tokens, tokens
+
+
+def calibration_lines(width: int, count: int = 100, tokens: int = 20, seed: int = 0) -> list[str]:
+    """Return a deterministic synthetic workload for a ``width``-column board."""
+    rng = random.Random(seed)
+    shapes = [member for member in TetrominoType if member.value.width <= width]
+    return [
+        ",".join(
+            f"{shape.name}{rng.randint(0, width - shape.value.width)}"
+            for shape in rng.choices(shapes, k=tokens)
+        )
+        for _ in range(count)
+    ]
+
+
+def _run_batch(factory: EngineFactory, width: int, height: int, lines: list[str]) -> list[object]:
+    """Return per-line heights, or the error type name for failing lines."""
+    engine = factory(width, height)
+    results: list[object] = []
+    for line in lines:
+        try:
+            results.extend(engine.batch_process((line,)))
+        except ValueError as exc:
+            results.append(type(exc).__name__)
+    return results
+
+
+def _time_per_line(
+    factory: EngineFactory, width: int, height: int, lines: list[str], budget: float
+) -> float:
+    """Return the mean seconds per line, stopping once ``budget`` is spent."""
+    engine = factory(width, height)
+    start = time.perf_counter()
+    elapsed = 0.0
+    count = 0
+    for line in lines:
+        try:
+            engine.batch_process((line,))
+        except ValueError:
+            pass
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget:
+            break
+    return elapsed / count if count else 0.0
+
+
+@dataclass(slots=True)
+class Calibration:
+    """Timings from one calibration run, in mean seconds per line per engine."""
+
+    timings: dict[str, float] = field(default_factory=dict)
+    rejected: list[str] = field(default_factory=list)
+
+    @property
+    def fastest(self) -> str:
+        """Name of the fastest engine that agreed with the reference."""
+        return min(self.timings, key=self.timings.__getitem__)
+
+
+def calibrate(
+    width: int,
+    height: int,
+    engines: Optional[dict[str, EngineFactory]] = None,
+    lines: int = CALIBRATION_LINES,
+    tokens: int = CALIBRATION_TOKENS,
+    *,
+    budget: float = CALIBRATION_BUDGET,
+    check_lines: int = CALIBRATION_CHECK_LINES,
+) -> Calibration:
+    """Time ``engines`` (all registered by default) on a synthetic workload.
+
+    The workload is ``lines`` random lines of ``tokens`` placements each.
+    Engines whose results on the first ``check_lines`` lines differ from
+    the reference engine's are rejected rather than timed. Each remaining
+    engine runs the workload until it finishes or ``budget`` seconds have
+    passed, and is scored by its mean time per line.
+    """
+    engines = ENGINES if engines is None else engines
+    workload = calibration_lines(width, lines, tokens)
+    sample = workload[:check_lines]
+    reference = ENGINES[REFERENCE]
+    expected = _run_batch(reference, width, height, sample)
+    calibration = Calibration()
+
+    for name, factory in engines.items():
+        if factory is not reference and _run_batch(factory, width, height, sample) != expected:
+            logger.warning("Engine %s disagrees with the reference; skipping", name)
+            calibration.rejected.append(name)
+            continue
+        calibration.timings[name] = _time_per_line(factory, width, height, workload, budget)
+    return calibration
+
+
+def select_engine(
+    width: int,
+    height: int,
+    input_size: Optional[int] = None,
+    *,
+    cache_path: Optional[str] = None,
+) -> str:
+    """Return the name of the fastest engine for this board and input size.
+
+    The choice is cached per ``(width, height, size bucket)`` in a JSON file
+    at ``cache_path`` (:func:`default_cache_path` by default), and each
+    bucket is calibrated on a workload sized by
+    :func:`calibration_workload`. A cached engine that is no longer
+    registered triggers a fresh calibration. Cache I/O failures are
+    logged and otherwise ignored.
+    """
+    cache_path = cache_path or default_cache_path()
+    key = f"{width}x{height}:{size_bucket(input_size)}"
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    name = cache.get(key)
+    if name in ENGINES:
+        return name
+
+    lines, tokens = calibration_workload(input_size, height)
+    name = calibrate(width, height, lines=lines, tokens=tokens).fastest
+    cache[key] = name
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except OSError as exc:
+        logger.warning("Could not write engine cache %s: %s", cache_path, exc)
+    return name
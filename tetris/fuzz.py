@@ -0,0 +1,261 @@
+"""Differential fuzzing of registered engines against the reference engine.
+
+Random cases are generated as short sequences of placement lines played
+on one board without resetting it, which exercises carried-over stacks,
+multi-row clears and "No space" errors. Every registered engine runs the
+same steps as the reference :class:`~tetris.app.TetrisGame`; after each
+step the returned height (or raised error type) and the board rows must
+match exactly.
+
+A mismatching case is shrunk by dropping whole steps and then single
+placements while the mismatch persists, so the report carries the
+smallest reproducer found. The same corpus is also timed per engine to
+report relative throughput.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+import io
+import random
+import time
+
+from tetris.app import TetrominoType
+from tetris.engines import ENGINES, REFERENCE, EngineFactory
+
+# Board sizes covering narrow, byte-boundary, array and list-backed grids.
+WIDTHS = (4, 8, 10, 17, 64, 65)
+HEIGHTS = (6, 20)
+
+_SHAPES = tuple(member.name for member in TetrominoType)
+
+# Outcome of one step: (height or error type name, board rows).
+_Outcome = tuple[object, tuple[int, ...]]
+
+
+@dataclass(slots=True)
+class Mismatch:
+    """A case where an engine diverged from the reference engine."""
+
+    engine: str
+    width: int
+    height: int
+    steps: list[str]
+    step: int
+    expected: _Outcome
+    actual: _Outcome
+
+    def format(self) -> str:
+        """Return a human-readable description of the mismatch."""
+        return (
+            f"{self.engine}: board {self.width}x{self.height}, "
+            f"step {self.step + 1} of {self.steps!r}\n"
+            f"  expected {self.expected[0]!r} rows {list(self.expected[1])}\n"
+            f"  actual   {self.actual[0]!r} rows {list(self.actual[1])}\n"
+        )
+
+
+@dataclass(slots=True)
+class FuzzReport:
+    """Summary of a differential fuzzing run."""
+
+    cases: int = 0
+    steps: int = 0
+    mismatches: list[Mismatch] = field(default_factory=list)
+    throughput: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True when no engine diverged from the reference."""
+        return not self.mismatches
+
+    def format(self) -> str:
+        """Return a human-readable report."""
+        out = io.StringIO()
+        out.write(f"Fuzzed {self.cases} cases ({self.steps} steps): ")
+        out.write("no mismatches\n" if self.ok else f"{len(self.mismatches)} mismatches\n")
+        for mismatch in self.mismatches:
+            out.write(mismatch.format())
+        if self.throughput:
+            reference = self.throughput.get(REFERENCE) or 1.0
+            out.write(f"\n{'Engine':<16}{'Lines/s':>14}{'Relative':>10}\n")
+            for name, rate in self.throughput.items():
+                out.write(f"{name:<16}{rate:>14.0f}{rate / reference:>9.2f}x\n")
+        return out.getvalue()
+
+
+def random_token(rng: random.Random, width: int, invalid_rate: float = 0.02) -> str:
+    """Return a random placement token for a board of ``width`` columns.
+
+    Columns favour the edges of the valid range. With probability
+    ``invalid_rate`` the token is malformed or out of range instead.
+    """
+    shape = rng.choice(_SHAPES)
+    if rng.random() < invalid_rate:
+        return rng.choice(
+            (f"X{rng.randrange(width)}", shape, f"{shape}?", f"{shape}{width}", f"{shape}-1")
+        )
+    max_column = width - TetrominoType[shape].value.width
+    if max_column < 0:
+        return f"{shape}0"
+    roll = rng.random()
+    if roll < 0.15:
+        column = 0
+    elif roll < 0.3:
+        column = max_column
+    else:
+        column = rng.randint(0, max_column)
+    return f"{shape}{column}"
+
+
+def random_case(
+    rng: random.Random,
+    width: int,
+    max_steps: int = 4,
+    max_tokens: int = 12,
+    invalid_rate: float = 0.02,
+) -> list[str]:
+    """Return a random case: a list of placement lines for one board."""
+    return [
+        ",".join(random_token(rng, width, invalid_rate) for _ in range(rng.randint(1, max_tokens)))
+        for _ in range(rng.randint(1, max_steps))
+    ]
+
+
+def run_case(factory: EngineFactory, width: int, height: int, steps: list[str]) -> list[_Outcome]:
+    """Play ``steps`` on one fresh engine and return the outcome of each."""
+    engine = factory(width, height)
+    outcomes: list[_Outcome] = []
+    for line in steps:
+        try:
+            result: object = engine.process_line(line)
+        except Exception as exc:
+            result = type(exc).__name__
+        outcomes.append((result, tuple(engine.grid)))
+    return outcomes
+
+
+def _first_difference(expected: list[_Outcome], actual: list[_Outcome]) -> Optional[int]:
+    for step, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            return step
+    return None
+
+
+def _diverges(factory: EngineFactory, width: int, height: int, steps: list[str]) -> bool:
+    reference = ENGINES[REFERENCE]
+    return _first_difference(
+        run_case(reference, width, height, steps), run_case(factory, width, height, steps)
+    ) is not None
+
+
+def _shrink_candidates(steps: list[str]) -> Iterator[list[str]]:
+    """Yield ``steps`` with one step, or one placement of a step, removed."""
+    if len(steps) > 1:
+        for i in range(len(steps)):
+            yield steps[:i] + steps[i + 1 :]
+    for i, line in enumerate(steps):
+        tokens = line.split(",")
+        if len(tokens) > 1:
+            for j in range(len(tokens)):
+                yield steps[:i] + [",".join(tokens[:j] + tokens[j + 1 :])] + steps[i + 1 :]
+
+
+def shrink(factory: EngineFactory, width: int, height: int, steps: list[str]) -> list[str]:
+    """Return a minimal sub-case of ``steps`` on which ``factory`` still diverges.
+
+    Greedily drops whole steps and single placements until no single
+    removal preserves the mismatch.
+    """
+    while True:
+        for candidate in _shrink_candidates(steps):
+            if _diverges(factory, width, height, candidate):
+                steps = candidate
+                break
+        else:
+            return steps
+
+
+def compare_case(
+    name: str, factory: EngineFactory, width: int, height: int, steps: list[str]
+) -> Optional[Mismatch]:
+    """Compare ``factory`` with the reference on one case.
+
+    Returns the shrunk :class:`Mismatch`, or ``None`` when the engine
+    agrees with the reference at every step.
+    """
+    if not _diverges(factory, width, height, steps):
+        return None
+    steps = shrink(factory, width, height, steps)
+    expected = run_case(ENGINES[REFERENCE], width, height, steps)
+    actual = run_case(factory, width, height, steps)
+    step = _first_difference(expected, actual)
+    if step is None:
+        # Only a non-deterministic engine can stop diverging here.
+        return None
+    return Mismatch(name, width, height, steps, step, expected[step], actual[step])
+
+
+def measure_throughput(
+    engines: dict[str, EngineFactory], lines: list[str], width: int = 10, height: int = 100
+) -> dict[str, float]:
+    """Return lines processed per second by each engine on ``lines``.
+
+    Each line runs on a freshly reset board, as in :class:`~tetris.app.TetrisApp`.
+    Lines that raise are still counted.
+    """
+    rates = {}
+    for name, factory in engines.items():
+        engine = factory(width, height)
+        start = time.perf_counter()
+        for line in lines:
+            engine.reset()
+            try:
+                engine.process_line(line)
+            except ValueError:
+                pass
+        elapsed = time.perf_counter() - start
+        rates[name] = len(lines) / elapsed if elapsed else float("inf")
+    return rates
+
+
+def fuzz(
+    engines: Optional[dict[str, EngineFactory]] = None,
+    *,
+    cases: int = 1000,
+    seed: int = 0,
+    widths: tuple[int, ...] = WIDTHS,
+    heights: tuple[int, ...] = HEIGHTS,
+    throughput_lines: int = 200,
+) -> FuzzReport:
+    """Fuzz ``engines`` (all registered ones by default) against the reference.
+
+    Runs ``cases`` random cases seeded by ``seed`` and records at most one
+    shrunk mismatch per engine. When ``throughput_lines`` is non-zero the
+    engines are also timed on that many random lines on a 10x100 board.
+    """
+    if engines is None:
+        engines = ENGINES
+    candidates = {name: factory for name, factory in engines.items() if name != REFERENCE}
+    rng = random.Random(seed)
+    report = FuzzReport()
+    failed: set[str] = set()
+
+    for _ in range(cases):
+        width, height = rng.choice(widths), rng.choice(heights)
+        steps = random_case(rng, width)
+        report.cases += 1
+        report.steps += len(steps)
+        for name, factory in candidates.items():
+            if name in failed:
+                continue
+            mismatch = compare_case(name, factory, width, height, steps)
+            if mismatch is not None:
+                failed.add(name)
+                report.mismatches.append(mismatch)
+
+    if throughput_lines:
+        lines = [",".join(random_token(rng, 10, 0) for _ in range(20)) for _ in range(throughput_lines)]
+        report.throughput = measure_throughput({REFERENCE: ENGINES[REFERENCE], **candidates}, lines)
+    return report
@@ -0,0 +1,272 @@
+"""Multiplexed Tetris engine for many concurrent keyed games.
+
+Input records have the form ``'<key>:<placements>'`` (e.g.
+``game42:T3,Q0``) and may interleave any number of games on one stream.
+Each record is routed to its game's board, which persists across
+records, and a ``'<key>:<height>'`` line is written per record in input
+order. Records are applied as chunks (see
+:meth:`~tetris.app.TetrisGame.process_chunk`), so each height matches
+the key's concatenated history and a failing record leaves its board
+unchanged.
+
+Records are read in batches. Within a batch the records of each key are
+applied together so every game is looked up once per batch. Game states
+live in a :class:`~tetris.app.SessionTable` that keeps a bounded number
+of live games and spills the least recently used boards to packed bytes;
+the spilled boards are only bounded when ``max_spilled`` is set. With ``workers`` greater than zero
+keys are hashed to a fixed set of worker processes, each owning the
+session table for its share of the keys.
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from multiprocessing.connection import Connection
+from typing import Iterable, Optional, TextIO
+import logging
+import multiprocessing
+import sys
+import zlib
+
+from tetris.app import EngineFactory, ErrorPolicy, SessionTable, TetrisGame
+
+logger = logging.getLogger(__name__)
+
+# A processed record: (input index, key, height or error message, failed).
+_Result = tuple[int, str, str, bool]
+
+
+def parse_record(record: str) -> tuple[str, str]:
+    """Split a ``'<key>:<placements>'`` record into ``(key, placements)``.
+
+    Raises
+    ------
+    ValueError
+        If the record has no key.
+    """
+    key, sep, line = record.partition(":")
+    key = key.strip()
+    if not sep or not key:
+        raise ValueError("Missing session key in record '%s'" % record)
+    return key, line
+
+
+def worker_for_key(key: str, workers: int) -> int:
+    """Return the index of the worker that owns ``key``.
+
+    Uses CRC-32 rather than :func:`hash` so the mapping is stable across
+    processes regardless of ``PYTHONHASHSEED``.
+    """
+    return zlib.crc32(key.encode()) % workers
+
+
+def apply_records(
+    table: SessionTable, records: Iterable[tuple[int, str]], *, stop_on_error: bool = False
+) -> list[_Result]:
+    """Apply indexed records to the games in ``table``.
+
+    Records are grouped by key, preserving their relative order, and each
+    group is applied against a single lookup of its game. Errors are
+    captured per record rather than raised so one bad record does not
+    prevent the rest of the batch from being applied. With
+    ``stop_on_error`` a key's remaining records are dropped after its
+    first failure, leaving its game as it was before that record.
+    """
+    grouped: dict[str, list[tuple[int, str]]] = {}
+    results: list[_Result] = []
+    for idx, record in records:
+        try:
+            key, line = parse_record(record)
+        except ValueError as exc:
+            results.append((idx, "", str(exc), True))
+            continue
+        grouped.setdefault(key, []).append((idx, line))
+
+    for key, lines in grouped.items():
+        game = table.get(key)
+        for idx, line in lines:
+            try:
+                results.append((idx, key, str(game.process_chunk(line)), False))
+            except ValueError as exc:
+                results.append((idx, key, str(exc), True))
+                if stop_on_error:
+                    break
+    return results
+
+
+def _worker_main(
+    conn: Connection,
+    width: int,
+    height: int,
+    max_sessions: int,
+    max_spilled: Optional[int],
+    factory: EngineFactory,
+    stop_on_error: bool,
+) -> None:
+    """Serve record batches for one worker process until ``None`` arrives."""
+    table = SessionTable(
+        width, height, max_sessions, spill=True, max_spilled=max_spilled, factory=factory
+    )
+    while (batch := conn.recv()) is not None:
+        conn.send(apply_records(table, batch, stop_on_error=stop_on_error))
+    conn.close()
+
+
+class MultiplexApp:
+    """Application coordinator for interleaved keyed game streams.
+
+    Mirrors :class:`~tetris.app.TetrisApp`: streams are injectable and
+    ``on_error`` selects the :class:`~tetris.app.ErrorPolicy` applied to
+    records that fail. ``max_sessions`` bounds the live games per process,
+    ``max_spilled`` the spilled boards per process (unbounded by default,
+    otherwise the oldest are discarded) and ``batch_size`` the number of
+    records applied per batch. Games are
+    built by ``factory(width, height)``, which must be picklable when
+    ``workers`` is used.
+
+    Under :attr:`ErrorPolicy.ABORT` a key stops at its first failing
+    record, so its game keeps the state of the last height written.
+    Other keys' records later in the same batch have already been
+    applied when the error is raised, although their heights are not
+    written.
+    """
+
+    __slots__ = (
+        "width",
+        "height",
+        "input_stream",
+        "output_stream",
+        "on_error",
+        "max_sessions",
+        "max_spilled",
+        "batch_size",
+        "workers",
+        "factory",
+        "table",
+    )
+
+    def __init__(
+        self,
+        width: int = 10,
+        height: int = 100,
+        *,
+        input_stream: TextIO = sys.stdin,
+        output_stream: TextIO = sys.stdout,
+        on_error: ErrorPolicy | str = ErrorPolicy.ABORT,
+        max_sessions: int = 1024,
+        max_spilled: Optional[int] = None,
+        batch_size: int = 1024,
+        workers: int = 0,
+        factory: EngineFactory = TetrisGame,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        if workers < 0:
+            raise ValueError("workers must not be negative")
+        self.width = width
+        self.height = height
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.on_error = ErrorPolicy(on_error)
+        self.max_sessions = max_sessions
+        self.max_spilled = max_spilled
+        self.batch_size = batch_size
+        self.workers = workers
+        self.factory = factory
+        # Workers own their session tables; only in-process mode needs one.
+        self.table = (
+            SessionTable(
+                width, height, max_sessions, spill=True, max_spilled=max_spilled, factory=factory
+            )
+            if workers == 0
+            else None
+        )
+
+    def _write_results(self, results: list[_Result], writer: TextIO) -> None:
+        """Write results in input order, applying the error policy."""
+        on_error = self.on_error
+        for _, key, value, failed in sorted(results):
+            if not failed:
+                writer.write(f"{key}:{value}\n")
+                continue
+            if on_error is ErrorPolicy.ABORT:
+                raise ValueError(value)
+            logger.warning("Session %s: %s", key, value)
+            if on_error is ErrorPolicy.EMIT_ERROR:
+                writer.write(f"{key}:error: {value}\n")
+
+    def _batches(self, reader: TextIO) -> Iterable[list[tuple[int, str]]]:
+        """Yield batches of indexed, stripped, non-blank records."""
+        records = ((idx, line.strip()) for idx, line in enumerate(reader))
+        records = ((idx, line) for idx, line in records if line)
+        while batch := list(islice(records, self.batch_size)):
+            yield batch
+
+    def process_stream(self, reader: Optional[TextIO] = None, writer: Optional[TextIO] = None) -> None:
+        """Process keyed records from ``reader`` and write heights to ``writer``."""
+        reader = reader or self.input_stream
+        writer = writer or self.output_stream
+
+        stop_on_error = self.on_error is ErrorPolicy.ABORT
+        table = self.table
+        if table is not None:
+            for batch in self._batches(reader):
+                results = apply_records(table, batch, stop_on_error=stop_on_error)
+                self._write_results(results, writer)
+            return
+
+        connections = []
+        processes = []
+        for _ in range(self.workers):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker_main,
+                args=(
+                    child_conn,
+                    self.width,
+                    self.height,
+                    self.max_sessions,
+                    self.max_spilled,
+                    self.factory,
+                    stop_on_error,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            connections.append(parent_conn)
+            processes.append(process)
+
+        try:
+            for batch in self._batches(reader):
+                shards: list[list[tuple[int, str]]] = [[] for _ in range(self.workers)]
+                results: list[_Result] = []
+                for idx, record in batch:
+                    try:
+                        key, _ = parse_record(record)
+                    except ValueError as exc:
+                        results.append((idx, "", str(exc), True))
+                        continue
+                    shards[worker_for_key(key, self.workers)].append((idx, record))
+                busy = [conn for conn, shard in zip(connections, shards) if shard]
+                for conn, shard in zip(connections, shards):
+                    if shard:
+                        conn.send(shard)
+                for conn in busy:
+                    results.extend(conn.recv())
+                self._write_results(results, writer)
+        finally:
+            for conn in connections:
+                try:
+                    conn.send(None)
+                except OSError:
+                    # The worker already exited; let the original error
+                    # propagate instead of a broken pipe.
+                    pass
+                conn.close()
+            for process in processes:
+                process.join()
+
+    def run(self) -> None:
+        """Run the multiplexer using the configured input and output."""
+        self.process_stream()
@@ -0,0 +1,299 @@
+"""Per-phase profiling of Tetris workloads.
+
+Runs an input file through :class:`~tetris.app.TetrisApp` under
+:mod:`cProfile` and/or :mod:`tracemalloc` and groups the results by
+engine phase so slow workloads can be reported without ad-hoc scripts.
+
+Time is attributed by each function's own time. Functions that do not
+belong to a phase (builtins such as ``str.split`` or ``array.tobytes``)
+are charged to the phase of whichever function called them.
+
+Memory is grouped by the phase of the allocating line. Snapshots taken
+between input lines at a fixed time interval are diffed to accumulate
+the bytes each phase allocated over the run; the bytes still held at the
+end of the run and the peak traced size are reported alongside. Memory
+freed between two snapshots is only visible in the peak.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import FunctionType
+from typing import Optional
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+from tetris.app import Board, ErrorPolicy, TetrisApp, TetrisGame
+from tetris.engines import EngineFactory, SkylineBoard
+
+# Engine phases in report order, each mapped to the functions that
+# implement it. Unlisted functions fall into ``other``.
+PHASES: dict[str, tuple[FunctionType, ...]] = {
+    "tokenize": (TetrisGame.validate_line, TetrisGame._parse_placement),
+    "landing search": (Board._landing_row, Board._check_collision, SkylineBoard._landing_row),
+    "place": (Board.place_tetromino, TetrisGame.place_tetromino),
+    "clear": (Board.clear_lines, TetrisGame.clear_lines),
+    "height": (Board.calculate_height, TetrisGame.calculate_height),
+    "reset": (Board.reset, Board.create_grid, TetrisGame.reset),
+    "I/O": (TetrisApp.process_stream,),
+}
+OTHER = "other"
+
+# Builtin methods charged to I/O regardless of their caller.
+_IO_BUILTINS = frozenset(("write", "read", "readline", "flush"))
+
+_FuncKey = tuple[str, int, str]
+# Raw pstats row: call count, primitive calls, own time, cumulative time
+# and the same figures per caller.
+_StatsRow = tuple[int, int, float, float, dict[_FuncKey, tuple[int, int, float, float]]]
+
+# Seconds between tracemalloc snapshots in the memory pass. Each snapshot
+# copies every live trace, so taking one per line would dominate the run.
+SNAPSHOT_INTERVAL = 0.5
+
+# Keep the profiler's own bookkeeping out of the memory figures.
+_UNTRACED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def _phase_index() -> dict[_FuncKey, str]:
+    """Map ``(filename, first line, name)`` of each phase function to its phase."""
+    index = {}
+    for phase, functions in PHASES.items():
+        for function in functions:
+            code = function.__code__
+            index[(code.co_filename, code.co_firstlineno, code.co_name)] = phase
+    return index
+
+
+def _line_index() -> dict[tuple[str, int], str]:
+    """Map every ``(filename, line)`` inside a phase function to its phase."""
+    index = {}
+    for phase, functions in PHASES.items():
+        for function in functions:
+            code = function.__code__
+            for _, _, line in code.co_lines():
+                if line is not None:
+                    index[(code.co_filename, line)] = phase
+    return index
+
+
+@dataclass(slots=True)
+class ProfileReport:
+    """Results of a profiling run grouped by engine phase."""
+
+    path: str
+    lines: int
+    width: int
+    height: int
+    wall_time: float = 0.0
+    phase_times: dict[str, float] = field(default_factory=dict)
+    phase_allocated: dict[str, int] = field(default_factory=dict)
+    phase_bytes: dict[str, int] = field(default_factory=dict)
+    peak_bytes: Optional[int] = None
+    stats: Optional[pstats.Stats] = None
+    top: int = 10
+
+    def format(self) -> str:
+        """Return a human-readable report."""
+        out = io.StringIO()
+        out.write(
+            f"Profile of {self.path}: {self.lines} lines, "
+            f"board {self.width}x{self.height}, wall time {self.wall_time:.4f}s\n\n"
+        )
+        phases = [*PHASES, OTHER]
+        total = sum(self.phase_times.values()) or 1.0
+        out.write(
+            f"{'Phase':<16}{'Time (s)':>12}{'Time %':>9}"
+            f"{'Allocated (KiB)':>18}{'Held at end (KiB)':>20}\n"
+        )
+        for phase in phases:
+            seconds = self.phase_times.get(phase, 0.0)
+            allocated = self.phase_allocated.get(phase, 0) / 1024
+            held = self.phase_bytes.get(phase, 0) / 1024
+            out.write(
+                f"{phase:<16}{seconds:>12.4f}{100 * seconds / total:>8.1f}%"
+                f"{allocated:>18.1f}{held:>20.1f}\n"
+            )
+        if self.peak_bytes is not None:
+            out.write(f"\nPeak traced memory: {self.peak_bytes / 1024:.1f} KiB\n")
+        if self.stats is not None:
+            out.write(f"\nTop {self.top} functions by own time:\n")
+            stats = pstats.Stats(stream=out)
+            stats.add(self.stats)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        return out.getvalue()
+
+
+def _builtin_name(label: str) -> str:
+    """Return the bare method name from a pstats builtin label.
+
+    pstats labels builtins as ``"<method 'write' of '_io.TextIOWrapper'
+    objects>"`` or ``"<built-in method builtins.len>"``.
+    """
+    if label.startswith("<method '"):
+        return label.split("'", 2)[1]
+    if label.startswith("<built-in method "):
+        return label[len("<built-in method ") : -1].rpartition(".")[2]
+    return label
+
+
+def _phase_times(stats: pstats.Stats) -> dict[str, float]:
+    """Sum own time per phase, charging unmapped functions to their callers."""
+    index = _phase_index()
+    times: dict[str, float] = {}
+    # pstats exposes its raw per-function table only as this attribute.
+    rows: dict[_FuncKey, _StatsRow] = getattr(stats, "stats")
+    for key, (_, _, tottime, _, callers) in rows.items():
+        phase = index.get(key)
+        if phase is None and key[0] == "~" and _builtin_name(key[2]) in _IO_BUILTINS:
+            phase = "I/O"
+        if phase is not None:
+            times[phase] = times.get(phase, 0.0) + tottime
+            continue
+        for caller, (_, _, caller_tottime, _) in callers.items():
+            caller_phase = index.get(caller, OTHER)
+            times[caller_phase] = times.get(caller_phase, 0.0) + caller_tottime
+    return times
+
+
+def _phase_bytes(snapshot: tracemalloc.Snapshot) -> dict[str, int]:
+    """Group the bytes held in ``snapshot`` by the phase of the allocating line."""
+    index = _line_index()
+    held: dict[str, int] = {}
+    for stat in snapshot.statistics("lineno"):
+        frame = stat.traceback[0]
+        phase = index.get((frame.filename, frame.lineno), OTHER)
+        held[phase] = held.get(phase, 0) + stat.size
+    return held
+
+
+class _SnapshotReader(io.StringIO):
+    """Input reader that charges new allocations to phases as it is read.
+
+    Before the first line, after the last one and, in between, before
+    the first line requested ``interval`` seconds after the previous
+    snapshot, a snapshot is taken and diffed against the previous one.
+    Growth at an allocating line between two snapshots is attributed to
+    that line's phase. :attr:`peak` tracks the traced memory outside the
+    profiler itself, and the time spent snapshotting is tallied in
+    :attr:`overhead`.
+    """
+
+    def __init__(self, text: str, interval: float = SNAPSHOT_INTERVAL) -> None:
+        super().__init__(text)
+        self.interval = interval
+        self.allocated: dict[str, int] = {}
+        self.peak = 0
+        self.overhead = 0.0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._index = _line_index()
+        self._traced = 0
+        self._level = 0
+        self._last = 0.0
+
+    def __next__(self) -> str:
+        if self.snapshot is None or time.perf_counter() - self._last >= self.interval:
+            self.record()
+        try:
+            return super().__next__()
+        except StopIteration:
+            self.record()
+            raise
+
+    def record(self) -> None:
+        """Accumulate the bytes allocated since the previous snapshot."""
+        start = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        # The peak since the last reset, less the traced level right after
+        # it, is the growth within the line; the snapshot held meanwhile
+        # stays in that level and so does not count towards it.
+        self.peak = max(self.peak, self._traced + peak - self._level)
+        snapshot = tracemalloc.take_snapshot().filter_traces(_UNTRACED)
+        if self.snapshot is not None:
+            allocated = self.allocated
+            for stat in snapshot.compare_to(self.snapshot, "lineno"):
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    phase = self._index.get((frame.filename, frame.lineno), OTHER)
+                    allocated[phase] = allocated.get(phase, 0) + stat.size_diff
+        self.snapshot = snapshot
+        self._traced = sum(trace.size for trace in snapshot.traces)
+        self.peak = max(self.peak, self._traced)
+        tracemalloc.reset_peak()
+        self._level = tracemalloc.get_traced_memory()[0]
+        self._last = time.perf_counter()
+        self.overhead += self._last - start
+
+
+def profile_file(
+    path: str,
+    width: int = 10,
+    height: int = 100,
+    *,
+    cpu: bool = True,
+    memory: bool = False,
+    on_error: ErrorPolicy | str = ErrorPolicy.SKIP,
+    top: int = 10,
+    pstats_path: Optional[str] = None,
+    factory: EngineFactory = TetrisGame,
+    snapshot_interval: float = SNAPSHOT_INTERVAL,
+) -> ProfileReport:
+    """Profile processing of the placement lines in ``path``.
+
+    ``cpu`` enables a :mod:`cProfile` pass and ``memory`` a separate
+    :mod:`tracemalloc` pass, so neither tool skews the other. Output
+    heights are written to :data:`os.devnull` to keep I/O realistic.
+    When ``pstats_path`` is given the raw cProfile data is dumped there
+    for tools such as ``snakeviz``, ``gprof2dot`` or ``flameprof``.
+    Games are built with ``factory(width, height)``. The memory pass
+    snapshots allocations at most every ``snapshot_interval`` seconds.
+    """
+    with open(path) as reader:
+        lines = sum(1 for line in reader if line.strip())
+    report = ProfileReport(path=path, lines=lines, width=width, height=height, top=top)
+
+    def run() -> None:
+        with open(path) as reader, open(os.devnull, "w") as writer:
+            app = TetrisApp(game=factory(width, height), on_error=on_error)
+            app.process_stream(reader, writer)
+
+    if cpu:
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.runcall(run)
+        report.wall_time = time.perf_counter() - start
+        report.stats = pstats.Stats(profiler)
+        report.phase_times = _phase_times(report.stats)
+        if pstats_path:
+            report.stats.dump_stats(pstats_path)
+
+    if memory:
+        with open(path) as f:
+            reader = _SnapshotReader(f.read(), snapshot_interval)
+        tracemalloc.start()
+        try:
+            # The reader takes its last snapshot when asked for a line past
+            # the end, while the app and its board are still alive.
+            with open(os.devnull, "w") as writer:
+                app = TetrisApp(game=factory(width, height), on_error=on_error)
+                start = time.perf_counter()
+                app.process_stream(reader, writer)
+                elapsed = time.perf_counter() - start - reader.overhead
+        finally:
+            tracemalloc.stop()
+        report.peak_bytes = reader.peak
+        report.phase_allocated = reader.allocated
+        if reader.snapshot is not None:
+            report.phase_bytes = _phase_bytes(reader.snapshot)
+        if not cpu:
+            report.wall_time = elapsed
+
+    return report
+